@@ -2,19 +2,28 @@
 Shared FastAPI dependencies — injected into route handlers.
 """
 
-from fastapi import Depends
+from typing import Annotated
+
+from fastapi import Depends, Request
 
 from app.services.source_client import HCSClient
 from app.services.transform_service import TransformService
 
 
-def get_hcs_client() -> HCSClient:
-    """Provide a fresh HCSClient (uses curl subprocess internally)."""
-    return HCSClient()
+def get_hcs_client(request: Request) -> HCSClient:
+    """Provide an HCSClient bound to the app's pooled httpx.AsyncClient and shared caches."""
+    return HCSClient(
+        http_client=request.app.state.http_client,
+        token_cache=request.app.state.token_cache,
+        lookup_cache=request.app.state.lookup_cache,
+        inflight=request.app.state.inflight,
+    )
+
+
+# Shared declaration so every route reuses the same Depends marker
+HCSClientDep = Annotated[HCSClient, Depends(get_hcs_client)]
 
 
-def get_transform_service(
-    hcs_client: HCSClient = Depends(get_hcs_client),
-) -> TransformService:
+def get_transform_service(hcs_client: HCSClientDep) -> TransformService:
     """Provide a TransformService with its dependencies wired up."""
     return TransformService(hcs_client=hcs_client)
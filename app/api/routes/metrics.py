@@ -2,16 +2,32 @@
 Metrics endpoint — query raw HCS metering data from the SC Northbound Interface.
 
 POST /metrics/
+
+The response is NDJSON (``application/x-ndjson``): one raw HCS metric record
+per line, streamed as SC pages arrive, with no enclosing status / total
+envelope.  Errors raised before the first line is sent are returned as the
+usual JSON error body.
 """
 
-from fastapi import APIRouter, Depends
+import asyncio
+from collections.abc import AsyncGenerator, AsyncIterator
+
+import orjson
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 
-from app.api.dependencies import get_hcs_client
+from app.api.dependencies import HCSClientDep
+from app.schemas import HCSMetricRecord
 from app.schemas.transform_schema import MetricsQueryRequest
-from app.services.source_client import HCSClient
 
 router = APIRouter(prefix="/metrics", tags=["Metrics"])
 
+_METRIC_LIST_ADAPTER = TypeAdapter(list[HCSMetricRecord])
+
+# Pages larger than this are encoded in a worker thread to keep the loop free
+_THREAD_ENCODE_THRESHOLD = 200
+
 
 @router.post(
     "/",
@@ -19,14 +35,16 @@ router = APIRouter(prefix="/metrics", tags=["Metrics"])
     description=(
         "Authenticates with HCS IAM, then queries the SC Northbound "
         "Interface for cloud service call detail records (CDRs).  "
-        "Returns the raw HCS metrics response."
+        "Streams the raw HCS metric records as NDJSON, one record per line, "
+        "as each SC page arrives."
     ),
+    response_class=StreamingResponse,
 )
 async def query_metrics(
     req: MetricsQueryRequest,
-    client: HCSClient = Depends(get_hcs_client),
-) -> dict:
-    records = await client.fetch_metrics(
+    client: HCSClientDep,
+) -> StreamingResponse:
+    pages = client.iter_metrics(
         region_code=req.region_code,
         domain_id=req.domain_id,
         start_time=req.start_time,
@@ -37,8 +55,40 @@ async def query_metrics(
         locale=req.locale,
         limit=req.limit,
     )
-    return {
-        "status": "ok",
-        "total": len(records),
-        "metrics": [r.model_dump() for r in records],
-    }
+
+    # Fetch the first page before streaming starts so auth / SC errors still
+    # reach the global error handlers as a normal JSON error response.
+    first_page = await anext(pages, None)
+
+    return StreamingResponse(
+        _ndjson_lines(first_page, pages),
+        media_type="application/x-ndjson",
+    )
+
+
+async def _ndjson_lines(
+    first_page: list[HCSMetricRecord] | None,
+    pages: AsyncGenerator[list[HCSMetricRecord], None],
+) -> AsyncIterator[bytes]:
+    """Serialise each page of records to NDJSON lines as it is produced."""
+    try:
+        if first_page is None:
+            return
+        yield await _encode_page_async(first_page)
+        async for page in pages:
+            yield await _encode_page_async(page)
+    finally:
+        # Client gone mid-stream: stop the upstream page fetches now, not at GC
+        await pages.aclose()
+
+
+async def _encode_page_async(page: list[HCSMetricRecord]) -> bytes:
+    if len(page) > _THREAD_ENCODE_THRESHOLD:
+        return await asyncio.to_thread(_encode_page, page)
+    return _encode_page(page)
+
+
+def _encode_page(page: list[HCSMetricRecord]) -> bytes:
+    return b"".join(
+        orjson.dumps(row) + b"\n" for row in _METRIC_LIST_ADAPTER.dump_python(page)
+    )
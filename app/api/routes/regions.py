@@ -4,13 +4,17 @@ Regions endpoint — list HCS regions from the SC Northbound Interface.
 GET /regions/
 """
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter
+from pydantic import TypeAdapter
 
-from app.api.dependencies import get_hcs_client
-from app.services.source_client import HCSClient
+from app.api.dependencies import HCSClientDep
+from app.schemas import HCSRegion
 
 router = APIRouter(prefix="/regions", tags=["Regions"])
 
+# Built once at import: dumps a whole list in a single pydantic-core pass
+_REGION_LIST_ADAPTER = TypeAdapter(list[HCSRegion])
+
 
 @router.get(
     "/",
@@ -21,11 +25,11 @@ router = APIRouter(prefix="/regions", tags=["Regions"])
     ),
 )
 async def list_regions(
-    client: HCSClient = Depends(get_hcs_client),
+    client: HCSClientDep,
 ) -> dict:
     regions = await client.fetch_regions()
     return {
         "status": "ok",
         "total": len(regions),
-        "regions": [r.model_dump(by_alias=True) for r in regions],
+        "regions": _REGION_LIST_ADAPTER.dump_python(regions, by_alias=True),
     }
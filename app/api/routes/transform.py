@@ -4,16 +4,28 @@ Transform endpoint — trigger HCS fetch + FOCUS transform pipeline.
 POST /transform/
 """
 
-from fastapi import APIRouter, Depends
+import asyncio
+from collections.abc import AsyncGenerator, AsyncIterator
+from typing import Any
 
-from app.api.dependencies import get_hcs_client
+import orjson
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+
+from app.api.dependencies import HCSClientDep
 from app.mappers.focus_mapper import FocusMapper
+from app.schemas import HCSMetricRecord
 from app.schemas.focus_schema import FocusRecord, FocusResponse
 from app.schemas.transform_schema import MetricsQueryRequest
-from app.services.source_client import HCSClient
 
 router = APIRouter(prefix="/transform", tags=["Transform"])
 
+_FOCUS_LIST_ADAPTER = TypeAdapter(list[FocusRecord])
+
+# Pages larger than this are mapped and encoded in a worker thread
+_THREAD_ENCODE_THRESHOLD = 200
+
 
 @router.post(
     "/",
@@ -22,14 +34,15 @@ router = APIRouter(prefix="/transform", tags=["Transform"])
     description=(
         "Authenticates with HCS IAM, queries the SC Northbound Interface "
         "for metering data, maps it into the FOCUS specification, and "
-        "returns the transformed records."
+        "returns the transformed records.  The body is streamed page by "
+        "page as SC results arrive; ``total_count`` is written last."
     ),
 )
 async def transform_data(
     req: MetricsQueryRequest,
-    client: HCSClient = Depends(get_hcs_client),
-) -> FocusResponse:
-    records = await client.fetch_metrics(
+    client: HCSClientDep,
+) -> StreamingResponse:
+    pages = client.iter_metrics(
         region_code=req.region_code,
         domain_id=req.domain_id,
         start_time=req.start_time,
@@ -40,20 +53,76 @@ async def transform_data(
         locale=req.locale,
         limit=req.limit,
     )
-
     mapper = FocusMapper()
-    focus_records: list[FocusRecord] = mapper.map_many(records)
-
-    return FocusResponse(
-        status="ok",
-        total_count=len(focus_records),
-        records=focus_records,
-        metadata={
-            "region_code": req.region_code,
-            "domain_id": req.domain_id,
-            "resource_type_code": req.resource_type_code or "all",
-            "period": req.period,
-            "start_time": req.start_time,
-            "end_time": req.end_time,
-        },
-    )
\ No newline at end of file
+    metadata = {
+        "region_code": req.region_code,
+        "domain_id": req.domain_id,
+        "resource_type_code": req.resource_type_code or "all",
+        "period": req.period,
+        "start_time": req.start_time,
+        "end_time": req.end_time,
+    }
+
+    # Fetch and map the first page up front so auth / SC / mapping errors on
+    # it still reach the global error handlers as a normal JSON error.
+    first_page = await anext(pages, None)
+    try:
+        first_chunk = await _map_page_async(mapper, first_page or [])
+    except BaseException:
+        await pages.aclose()
+        raise
+
+    return StreamingResponse(
+        _focus_response_body(mapper, metadata, first_chunk, pages),
+        media_type="application/json",
+    )
+
+
+async def _focus_response_body(
+    mapper: FocusMapper,
+    metadata: dict[str, Any],
+    first_chunk: tuple[bytes, int],
+    pages: AsyncGenerator[list[HCSMetricRecord], None],
+) -> AsyncIterator[bytes]:
+    """
+    Emit a FocusResponse-shaped JSON object incrementally.
+
+    Keys are written as status, metadata, records, total_count so the count
+    can follow the records it describes.
+    """
+    try:
+        yield b'{"status":"ok","metadata":' + orjson.dumps(metadata) + b',"records":['
+
+        chunk, total = first_chunk
+        sep = b""
+        if chunk:
+            yield chunk
+            sep = b","
+        async for page in pages:
+            chunk, count = await _map_page_async(mapper, page)
+            if chunk:
+                yield sep + chunk
+                sep = b","
+                total += count
+
+        yield b'],"total_count":' + str(total).encode() + b"}"
+    finally:
+        # Stop the upstream page fetches as soon as the stream ends early
+        await pages.aclose()
+
+
+async def _map_page_async(
+    mapper: FocusMapper, page: list[HCSMetricRecord]
+) -> tuple[bytes, int]:
+    if len(page) > _THREAD_ENCODE_THRESHOLD:
+        return await asyncio.to_thread(_map_page, mapper, page)
+    return _map_page(mapper, page)
+
+
+def _map_page(mapper: FocusMapper, page: list[HCSMetricRecord]) -> tuple[bytes, int]:
+    """Map a page and return its records as comma-joined JSON plus the count."""
+    records = mapper.map_many(page)
+    if not records:
+        return b"", 0
+    # Strip the enclosing [ ] so pages can be spliced into one array
+    return _FOCUS_LIST_ADAPTER.dump_json(records)[1:-1], len(records)
@@ -4,13 +4,22 @@ VDCs endpoint — list HCS VDCs (tenants) from the SC Northbound Interface.
 GET /vdcs/
 """
 
-from fastapi import APIRouter, Depends, Query
+import asyncio
 
-from app.api.dependencies import get_hcs_client
-from app.services.source_client import HCSClient
+from fastapi import APIRouter, Query
+from pydantic import TypeAdapter
+
+from app.api.dependencies import HCSClientDep
+from app.schemas import HCSVDC
 
 router = APIRouter(prefix="/vdcs", tags=["VDCs"])
 
+_VDC_LIST_ADAPTER = TypeAdapter(list[HCSVDC])
+
+# Above this many VDCs the dump runs in a worker thread so it does not
+# stall other requests on the event loop; below it the hop isn't worth it.
+_THREAD_DUMP_THRESHOLD = 200
+
 
 @router.get(
     "/",
@@ -21,20 +30,24 @@ router = APIRouter(prefix="/vdcs", tags=["VDCs"])
     ),
 )
 async def list_vdcs(
+    client: HCSClientDep,
     limit: int = Query(default=1000, ge=1, le=1000, description="Page size"),
     level: int | None = Query(default=None, ge=1, le=5,
                               description="VDC level (1-5)"),
     is_domain: str | None = Query(
         default=None, description="'1' = tenants only, '0' = non-tenants"),
-    client: HCSClient = Depends(get_hcs_client),
 ) -> dict:
     vdcs = await client.fetch_vdcs(
         level=level,
         is_domain=is_domain,
         limit=limit,
     )
+    if len(vdcs) > _THREAD_DUMP_THRESHOLD:
+        payload = await asyncio.to_thread(_VDC_LIST_ADAPTER.dump_python, vdcs)
+    else:
+        payload = _VDC_LIST_ADAPTER.dump_python(vdcs)
     return {
         "status": "ok",
         "total": len(vdcs),
-        "vdcs": [v.model_dump() for v in vdcs],
+        "vdcs": payload,
     }
@@ -4,7 +4,7 @@ Application settings loaded from environment variables.
 Uses pydantic-settings to validate and type-cast env vars at startup.
 """
 
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -39,8 +39,17 @@ class Settings(BaseSettings):
     # ── HCS ManageOne — SC Northbound Interface ───────────────────────
     sc_domain: str = "https://sc.example.huaweicloud.com"
     sc_api_timeout: int = 30
+    sc_page_concurrency: int = 8  # Max SC pages in flight per paginated query
     hcs_verify_ssl: bool = False  # Set to True in production with valid certs
 
+    # ── Lookup caches (TTLs in seconds) ───────────────────────────────
+    regions_cache_ttl: float = 3600.0
+    vdcs_cache_ttl: float = 300.0
+    # Expired entries younger than this are served while refreshing in background
+    lookup_cache_stale_ttl: float = 300.0
+    # Least recently used entries beyond this are evicted
+    lookup_cache_max_entries: int = 1024
+
     # ── Logging ───────────────────────────────────────────────────────
     log_level: str = "INFO"
     log_format: Literal["json", "console"] = "json"
@@ -48,12 +57,12 @@ class Settings(BaseSettings):
     # ── CORS ──────────────────────────────────────────────────────────
     allowed_origins: str = "http://localhost:3000,http://localhost:8000"
 
-    @property
+    @cached_property
     def cors_origins(self) -> list[str]:
-        """Parse comma-separated origins into a list."""
+        """Parse comma-separated origins into a list (computed once per instance)."""
         return [o.strip() for o in self.allowed_origins.split(",") if o.strip()]
 
-    @property
+    @cached_property
     def is_development(self) -> bool:
         return self.app_env == "development"
 
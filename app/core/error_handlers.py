@@ -13,7 +13,6 @@ so clients always receive a predictable error shape:
     }
 """
 
-import uuid
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
@@ -21,6 +20,7 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from app.core.exceptions import AppException
 from app.core.logging import get_logger
+from app.core.middleware import new_request_id
 
 logger = get_logger(__name__)
 
@@ -157,4 +157,4 @@ def _get_request_id(request: Request) -> str:
     """
     Return the request ID from state (set by middleware) or generate one.
     """
-    return getattr(request.state, "request_id", uuid.uuid4().hex)
+    return getattr(request.state, "request_id", None) or new_request_id()
@@ -15,9 +15,10 @@ Usage:
 
 import logging
 import sys
+from contextvars import ContextVar
 from typing import Literal
 
-from pythonjsonlogger import json as json_logger
+from pythonjsonlogger.orjson import OrjsonFormatter
 
 
 LOG_FORMAT_CONSOLE = (
@@ -26,6 +27,12 @@ LOG_FORMAT_CONSOLE = (
 
 LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+# Third-party loggers capped at WARNING to keep request logs readable
+_NOISY_LOGGERS = ("httpcore", "httpx", "uvicorn.access", "asyncio")
+
+# Request ID of the request being handled in the current task ("-" outside one)
+REQUEST_ID_CTX: ContextVar[str] = ContextVar("request_id", default="-")
+
 
 def setup_logging(
     level: str = "INFO",
@@ -38,14 +45,15 @@ def setup_logging(
         level:      Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL).
         log_format: 'json' for structured JSON lines, 'console' for human-readable.
     """
+    lvl = level.upper()
+
     root_logger = logging.getLogger()
-    root_logger.setLevel(level.upper())
+    root_logger.setLevel(lvl)
 
     # Remove any pre-existing handlers to avoid duplicate log lines
     root_logger.handlers.clear()
 
     handler = logging.StreamHandler(sys.stdout)
-    handler.setLevel(level.upper())
 
     if log_format == "json":
         formatter = _build_json_formatter()
@@ -54,15 +62,16 @@ def setup_logging(
             LOG_FORMAT_CONSOLE, datefmt=LOG_DATE_FORMAT)
 
     handler.setFormatter(formatter)
+    handler.addFilter(_RequestIdFilter())
     root_logger.addHandler(handler)
 
     # Silence noisy third-party loggers
-    for noisy in ("httpcore", "httpx", "uvicorn.access", "asyncio"):
+    for noisy in _NOISY_LOGGERS:
         logging.getLogger(noisy).setLevel(logging.WARNING)
 
     root_logger.info(
         "Logging initialised",
-        extra={"log_level": level.upper(), "log_format": log_format},
+        extra={"log_level": lvl, "log_format": log_format},
     )
 
 
@@ -78,9 +87,23 @@ def get_logger(name: str) -> logging.Logger:
 # ─── Internal ─────────────────────────────────────────────────────────
 
 
-def _build_json_formatter() -> json_logger.JsonFormatter:
-    """Build a JSON log formatter with standard fields."""
-    return json_logger.JsonFormatter(
+class _RequestIdFilter(logging.Filter):
+    """
+    Inject the current request_id (from REQUEST_ID_CTX) into every log record.
+
+    An explicit ``extra={"request_id": ...}`` wins: the unhandled-exception
+    log is emitted after RequestContextMiddleware has reset the ContextVar.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = REQUEST_ID_CTX.get()  # type: ignore[attr-defined]
+        return True
+
+
+def _build_json_formatter() -> OrjsonFormatter:
+    """Build a JSON log formatter with standard fields, encoded by orjson."""
+    return OrjsonFormatter(
         fmt="%(asctime)s %(levelname)s %(name)s %(message)s",
         datefmt=LOG_DATE_FORMAT,
         rename_fields={
@@ -4,81 +4,93 @@ Application middleware.
 RequestContextMiddleware:
   - Assigns a unique request_id (or reads X-Request-ID header).
   - Logs request start / finish with timing.
-  - Injects request_id into every log record via a filter.
+  - Exposes request_id to every log record via REQUEST_ID_CTX.
+
+Implemented as a plain ASGI middleware (no BaseHTTPMiddleware), so each
+request runs in the caller's task without extra anyio tasks or memory
+streams, and streaming responses pass straight through.
 """
 
-import time
-import uuid
 import logging
+import random
+import time
 
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from app.core.logging import get_logger
+from app.core.logging import REQUEST_ID_CTX, get_logger
 
 logger = get_logger(__name__)
 
+# Request IDs are log-correlation tokens, not secrets, so the Mersenne
+# Twister is plenty and avoids a getrandom() syscall per request. The
+# module-level instance is reseeded after fork, so workers don't collide.
+_getrandbits = random.getrandbits
 
-class RequestContextMiddleware(BaseHTTPMiddleware):
-    """Attach a request_id to every request and log timing."""
-
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        # Use incoming header or generate a new one
-        request_id = request.headers.get("X-Request-ID", uuid.uuid4().hex)
-        request.state.request_id = request_id
-
-        # Add request_id to all log records for this request
-        ctx_filter = _RequestIdFilter(request_id)
-        logging.getLogger().addFilter(ctx_filter)
-
-        start = time.perf_counter()
-
-        logger.info(
-            "Request started",
-            extra={
-                "request_id": request_id,
-                "method": request.method,
-                "path": str(request.url.path),
-                "query": str(request.url.query),
-            },
-        )
 
-        try:
-            response = await call_next(request)
-        except Exception:
-            # Let the error handlers deal with it; just remove the filter
-            raise
-        finally:
-            logging.getLogger().removeFilter(ctx_filter)
+def new_request_id() -> str:
+    """Return a fresh 32-char hex request ID."""
+    return f"{_getrandbits(128):032x}"
 
-        duration_ms = round((time.perf_counter() - start) * 1000, 2)
 
-        logger.info(
-            "Request completed",
-            extra={
-                "request_id": request_id,
-                "method": request.method,
-                "path": str(request.url.path),
-                "status_code": response.status_code,
-                "duration_ms": duration_ms,
-            },
-        )
-
-        # Echo the request_id back to the caller
-        response.headers["X-Request-ID"] = request_id
-        return response
+class RequestContextMiddleware:
+    """Attach a request_id to every request and log timing."""
 
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-class _RequestIdFilter(logging.Filter):
-    """Inject request_id into every log record."""
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    def __init__(self, request_id: str) -> None:
-        super().__init__()
-        self.request_id = request_id
+        # Use incoming header or generate a new one
+        request_id = Headers(scope=scope).get("X-Request-ID") or new_request_id()
+        # Backs request.state.request_id for the error handlers
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        # Scope request_id to this request's context for the log filter
+        ctx_token = REQUEST_ID_CTX.set(request_id)
+
+        log_info = logger.isEnabledFor(logging.INFO)
+        method = scope["method"]
+        path = scope["path"]
+        status_code = 500
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Echo the request_id back to the caller
+                MutableHeaders(scope=message)["X-Request-ID"] = request_id
+            await send(message)
 
-    def filter(self, record: logging.LogRecord) -> bool:
-        record.request_id = self.request_id  # type: ignore[attr-defined]
-        return True
+        start = time.perf_counter()
+        try:
+            if log_info:
+                logger.info(
+                    "Request started",
+                    extra={
+                        "request_id": request_id,
+                        "method": method,
+                        "path": path,
+                        "query": scope["query_string"].decode("latin-1"),
+                    },
+                )
+
+            await self.app(scope, receive, send_with_request_id)
+
+            if log_info:
+                duration_ms = round((time.perf_counter() - start) * 1000, 2)
+                logger.info(
+                    "Request completed",
+                    extra={
+                        "request_id": request_id,
+                        "method": method,
+                        "path": path,
+                        "status_code": status_code,
+                        "duration_ms": duration_ms,
+                    },
+                )
+        finally:
+            REQUEST_ID_CTX.reset(ctx_token)
@@ -5,18 +5,40 @@ FastAPI application factory.
 from contextlib import asynccontextmanager
 from collections.abc import AsyncIterator
 
+import httpx
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.config import get_settings
 from app.core.logging import setup_logging, get_logger
 from app.core.error_handlers import register_error_handlers
 from app.core.middleware import RequestContextMiddleware
 from app.api.routes import router as api_router
+from app.services.source_client import TokenCache
+from app.utils.cache import SingleFlight, TTLCache
 
 settings = get_settings()
 
 
+# ─── Upstream HTTP client ─────────────────────────────────────────────
+
+def create_http_client() -> httpx.AsyncClient:
+    """Build the shared, pooled keep-alive client for HCS IAM / SC."""
+    return httpx.AsyncClient(
+        http2=True,
+        verify=settings.hcs_verify_ssl,
+        timeout=settings.sc_api_timeout,
+        limits=httpx.Limits(
+            max_keepalive_connections=100,
+            max_connections=200,
+            # httpx drops idle connections after 5s by default; keep TLS
+            # sessions to IAM / SC warm across bursts of user requests
+            keepalive_expiry=60.0,
+        ),
+    )
+
+
 # ─── Lifespan: startup / shutdown ─────────────────────────────────────
 
 @asynccontextmanager
@@ -35,9 +57,19 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         },
     )
 
+    app.state.http_client = create_http_client()
+    app.state.token_cache = TokenCache()
+    app.state.lookup_cache = TTLCache(
+        ttl=settings.vdcs_cache_ttl,
+        stale_ttl=settings.lookup_cache_stale_ttl,
+        max_entries=settings.lookup_cache_max_entries,
+    )
+    app.state.inflight = SingleFlight()
+
     yield
 
     # Shutdown
+    await app.state.http_client.aclose()
     logger.info("Application shut down gracefully.")
 
 
@@ -51,6 +83,7 @@ def create_app() -> FastAPI:
         docs_url="/docs" if settings.is_development else None,
         redoc_url="/redoc" if settings.is_development else None,
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
     # Middleware (order matters — outermost first)
@@ -6,6 +6,10 @@ column mapping defined in format.md.
 """
 
 from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any
+
+from pydantic import TypeAdapter
 
 from app.core.exceptions import MappingFieldException, TransformationException
 from app.core.logging import get_logger
@@ -18,6 +22,52 @@ logger = get_logger(__name__)
 # Default billing currency for MTN Nigeria HCS
 _DEFAULT_CURRENCY = "NGN"
 
+# Validates a whole page of mapped field dicts in one call
+_FOCUS_LIST_ADAPTER = TypeAdapter(list[FocusRecord])
+
+
+@lru_cache(maxsize=4096)
+def _parse_hcs_datetime_cached(value: str) -> datetime:
+    """
+    Parse an HCS timestamp to an aware UTC datetime, memoised on the raw string.
+
+    A page shares a handful of period boundaries, so almost every call is
+    a cache hit. 4096 entries covers a year of hourly buckets. Invalid
+    values raise ValueError, which lru_cache does not store.
+    """
+    # Fast path for the canonical 'YYYY-MM-DD HH:MM:SS' layout.  The separator
+    # checks keep fromisoformat's wider ISO syntax (week dates, offsets,
+    # basic format) out, so anything else is left to strptime's rules.
+    if (
+        len(value) == 19
+        and value[4] == "-" and value[7] == "-" and value[10] == " "
+        and value[13] == ":" and value[16] == ":"
+    ):
+        try:
+            return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+        except ValueError:
+            pass
+    return datetime.strptime(value, "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+
+
+@lru_cache(maxsize=8192)
+def _parse_tags_cached(raw_tag: str) -> tuple[tuple[str, str], ...]:
+    """
+    Split an HCS tag string into (key, value) pairs, memoised on the raw string.
+
+    Returns a tuple so the cached value is immutable; callers build their
+    own dict from it.
+    """
+    tags: dict[str, str] = {}
+    for pair in raw_tag.split(","):
+        pair = pair.strip()
+        if "=" in pair:
+            key, _, val = pair.partition("=")
+            tags[key.strip()] = val.strip()
+        elif pair:
+            tags["tag"] = pair
+    return tuple(tags.items())
+
 
 class FocusMapper(BaseMapper[HCSMetricRecord, FocusRecord]):
     """Map HCS ManageOne metering records into the FOCUS specification."""
@@ -36,6 +86,20 @@ class FocusMapper(BaseMapper[HCSMetricRecord, FocusRecord]):
         self._vdc_name = vdc_name
         self._vdc_id = vdc_id
 
+        # Fields that are the same for every record this mapper produces
+        self._const_fields: dict[str, Any] = dict(
+            billing_account_name=tenant_name,
+            billing_account_id=tenant_id,
+            sub_account_name=vdc_name or "Unknown VDC",
+            application_id="",
+            application_name="",
+            pricing_currency=billing_currency,
+            billing_currency=billing_currency,
+            provider="Huawei",
+            publisher="MTN",
+            invoice_issuer="MTN",
+        )
+
     # def map_record(self, source: HCSMetricRecord) -> FocusRecord:
     #     """
     #     Transform one HCSMetricRecord → FocusRecord.
@@ -133,69 +197,7 @@ class FocusMapper(BaseMapper[HCSMetricRecord, FocusRecord]):
    
     def map_record(self, source: HCSMetricRecord) -> FocusRecord:
         try:
-            # Parse HCS time strings into datetime objects
-            charge_start = self._parse_hcs_datetime(source.start_time)
-            charge_end = self._parse_hcs_datetime(source.end_time)
-
-            # Compute billed cost: price * usage_value
-            price = self._safe_float(source.price)
-            usage_value = source.usage_value or 0.0
-            billed_cost = round(price * usage_value, 6)
-
-            # Parse tags
-            tags = self._parse_tags(source.tag)
-
-            # Handle empty/nullable fields
-            availability_zone = source.az_code or "Unknown"
-            resource_display_name = source.resource_display_name or source.resource_id or "Unnamed"
-
-            return FocusRecord(
-                billing_account_name=self._tenant_name,
-                billing_account_id=self._tenant_id,
-
-                sub_account_name=self._vdc_name or "Unknown VDC",
-                sub_account_id=source.vdc_id or self._vdc_id,
-
-                sub_child_account_id=source.upper_vdc_id or "N/A",
-                sub_child_account_name=source.vdc_id or "N/A",
-
-                availability_zone=availability_zone,
-                region=source.region_code or "Unknown",
-                resource_space_name=resource_display_name,
-                resource_space_id=source.enterprise_project_id or "N/A",
-                resource_type=source.resource_type_code or "Unknown",
-                resource_name=resource_display_name,
-                resource_id=source.resource_id,
-                enterprise_project_id=source.enterprise_project_id or "N/A",
-
-                tags=tags,
-
-                application_id="",
-                application_name="",
-
-                charge_period_start=charge_start,
-                charge_period_end=charge_end,
-
-                metering_metric=source.accumulate_mode or "Unknown",
-                metering_value=usage_value,
-                metering_unit_name=source.meter_unit_name or source.price_unit or "Unknown",
-                unit=source.price_unit or "Unknown",
-                usage=usage_value,
-
-                unit_price=price,
-                unit_price_unit=source.price_unit or "Unknown",
-                pricing_unit=source.price_unit or "Unknown",
-                pricing_currency=self._billing_currency,
-                pricing_currency_list_unit_price=price,
-
-                billed_cost=billed_cost,
-                billing_currency=self._billing_currency,
-                consumed_unit=source.price_unit or "Unknown",
-
-                provider="Huawei",
-                publisher="MTN",
-                invoice_issuer="MTN",
-            )
+            return FocusRecord(**self.map_record_dict(source))
         except MappingFieldException:
             raise
         except Exception as exc:
@@ -208,7 +210,103 @@ class FocusMapper(BaseMapper[HCSMetricRecord, FocusRecord]):
                 message=f"Failed to transform HCS record '{source.id}'.",
                 details={"source_id": source.id, "reason": str(exc)},
             ) from exc
-    
+
+    def map_record_dict(self, source: HCSMetricRecord) -> dict[str, Any]:
+        """Return the FOCUS fields for ``source`` as a plain dict."""
+        return self._build_fields(
+            source,
+            # Parse HCS time strings into datetime objects
+            self._parse_hcs_datetime(source.start_time),
+            self._parse_hcs_datetime(source.end_time),
+            self._parse_tags(source.tag),
+        )
+
+    def map_many(self, sources: list[HCSMetricRecord]) -> list[FocusRecord]:
+        """
+        Batch path: parse each distinct timestamp / tag string once per
+        page, then build every row from those lookup tables.
+
+        Falls back to the per-record path on any failure so the caller
+        gets the same per-record error as ``map_record`` would raise.
+        """
+        try:
+            parse_dt = self._parse_hcs_datetime
+            times = {
+                v: parse_dt(v)
+                for v in {s.start_time for s in sources} | {s.end_time for s in sources}
+            }
+            parse_tags = self._parse_tags
+            tag_table = {v: parse_tags(v) for v in {s.tag for s in sources}}
+            build = self._build_fields
+            return _FOCUS_LIST_ADAPTER.validate_python(
+                [
+                    build(s, times[s.start_time], times[s.end_time], tag_table[s.tag])
+                    for s in sources
+                ]
+            )
+        except Exception:
+            return [self.map_record(s) for s in sources]
+
+    def _build_fields(
+        self,
+        source: HCSMetricRecord,
+        charge_start: datetime,
+        charge_end: datetime,
+        tags: dict[str, str],
+    ) -> dict[str, Any]:
+        """Assemble the FOCUS field dict from a record and its parsed parts."""
+        # Fields read more than once below
+        vdc_id = source.vdc_id
+        resource_id = source.resource_id
+
+        # Compute billed cost: price * usage_value
+        price = self._safe_float(source.price)
+        usage_value = source.usage_value or 0.0
+        billed_cost = round(price * usage_value, 6)
+
+        # Handle empty/nullable fields
+        availability_zone = source.az_code or "Unknown"
+        resource_display_name = source.resource_display_name or resource_id or "Unnamed"
+        project_id = source.enterprise_project_id or "N/A"
+        unit = source.price_unit or "Unknown"
+
+        return dict(
+            self._const_fields,
+
+            sub_account_id=vdc_id or self._vdc_id,
+
+            sub_child_account_id=source.upper_vdc_id or "N/A",
+            sub_child_account_name=vdc_id or "N/A",
+
+            availability_zone=availability_zone,
+            region=source.region_code or "Unknown",
+            resource_space_name=resource_display_name,
+            resource_space_id=project_id,
+            resource_type=source.resource_type_code or "Unknown",
+            resource_name=resource_display_name,
+            resource_id=resource_id,
+            enterprise_project_id=project_id,
+
+            tags=tags,
+
+            charge_period_start=charge_start,
+            charge_period_end=charge_end,
+
+            metering_metric=source.accumulate_mode or "Unknown",
+            metering_value=usage_value,
+            metering_unit_name=source.meter_unit_name or unit,
+            unit=unit,
+            usage=usage_value,
+
+            unit_price=price,
+            unit_price_unit=unit,
+            pricing_unit=unit,
+            pricing_currency_list_unit_price=price,
+
+            billed_cost=billed_cost,
+            consumed_unit=unit,
+        )
+
     # ── Private helpers ───────────────────────────────────────────────
 
     @staticmethod
@@ -223,8 +321,7 @@ class FocusMapper(BaseMapper[HCSMetricRecord, FocusRecord]):
                 reason="Empty datetime value.",
             )
         try:
-            dt = datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
-            return dt.replace(tzinfo=timezone.utc)
+            return _parse_hcs_datetime_cached(value)
         except ValueError as exc:
             raise MappingFieldException(
                 field_name="start_time/end_time",
@@ -234,6 +331,9 @@ class FocusMapper(BaseMapper[HCSMetricRecord, FocusRecord]):
     @staticmethod
     def _safe_float(value: str) -> float:
         """Convert a string price to float, defaulting to 0.0."""
+        # Missing/empty prices are common; skip the exception round-trip
+        if not value:
+            return 0.0
         try:
             return float(value)
         except (ValueError, TypeError):
@@ -249,16 +349,6 @@ class FocusMapper(BaseMapper[HCSMetricRecord, FocusRecord]):
           - 'key1=value1,key2=value2' → {key1: value1, key2: value2}
           - Plain string → {tag: <raw_string>}
         """
-        if not raw_tag or not raw_tag.strip():
+        if not raw_tag:
             return {}
-
-        tags: dict[str, str] = {}
-        for pair in raw_tag.split(","):
-            pair = pair.strip()
-            if "=" in pair:
-                key, _, val = pair.partition("=")
-                tags[key.strip()] = val.strip()
-            elif pair:
-                tags["tag"] = pair
-
-        return tags
+        return dict(_parse_tags_cached(raw_tag))
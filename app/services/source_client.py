@@ -5,20 +5,28 @@ Handles:
   1. Authentication via IAM (token acquisition).
   2. Querying metering/metrics data from SC API.
 
-Uses curl (via subprocess) for all HTTP calls so system/VPN routing and
-SSL bypass are inherited automatically — identical to running curl directly.
-asyncio.to_thread() keeps the event loop unblocked.
+All HTTP calls go through a shared ``httpx.AsyncClient`` created once in the
+application lifespan, so TCP/TLS connections are pooled and kept alive across
+requests instead of being re-established per call.
 """
 
 import asyncio
-import json
-import subprocess
-from datetime import datetime, timezone, timedelta
-from typing import Any
+import logging
+import re
+import time
+from collections import deque
+from collections.abc import AsyncGenerator, Awaitable, Callable, Container, Iterable
+from datetime import datetime
+from itertools import islice
+from typing import Any, Generic, TypeVar
 from urllib.parse import urlencode
 
+import httpx
+import orjson
+
 from app.config import get_settings
 from app.core.exceptions import (
+    AppException,
     AuthenticationException,
     SourceAPIConnectionException,
     SourceAPIException,
@@ -26,13 +34,14 @@ from app.core.exceptions import (
 )
 from app.core.logging import get_logger
 from app.schemas import (
+    HCSVDC,
     HCSMetricRecord,
     HCSMetricsResponse,
     HCSRegion,
     HCSRegionsResponse,
-    HCSVDC,
     HCSVDCsResponse,
 )
+from app.utils.cache import SingleFlight, TTLCache
 
 logger = get_logger(__name__)
 
@@ -40,170 +49,402 @@ _METRICS_ENDPOINT = "/rest/metering/v3.0/query-metrics-data"
 _REGIONS_ENDPOINT = "/silvan/rest/v1.0/regions"
 _VDCS_ENDPOINT = "/rest/vdc/v3.0/vdcs"
 
-_LOGIN_REDIRECT_MARKER = "authui/login"
+_LOGIN_REDIRECT_MARKER = b"authui/login"
+# First non-blank byte of a response body: '{' / '[' for JSON, '<' for HTML
+_BODY_START_RE = re.compile(rb"\s*(.)", re.DOTALL)
 
+_IAM_HEADERS = {"Content-Type": "application/json", "Accept": "application/json"}
 
-# ── curl response container ───────────────────────────────────────────
+# Assumed token lifetime in seconds when IAM omits expires_at (HCS default is 24 h)
+_DEFAULT_TOKEN_TTL = 23 * 3600.0
 
-class _CurlResponse:
-    __slots__ = ("status_code", "headers", "text")
+# Default TTL for a client-owned lookup cache; per-lookup TTLs come from settings
+_LOOKUP_CACHE_TTL = 300.0
 
-    def __init__(self, status_code: int, headers: dict[str, str], text: str) -> None:
-        self.status_code = status_code
-        self.headers = headers
-        self.text = text
+PageT = TypeVar("PageT")
 
-    def json(self) -> Any:
-        return json.loads(self.text)
 
+# ── Status handling ───────────────────────────────────────────────────
 
-# ── low-level curl helper ─────────────────────────────────────────────
+def _auth_error(source: str, status: int, details: dict[str, Any]) -> AppException:
+    return AuthenticationException(
+        message=f"{source} authentication rejected (HTTP {status}).",
+        details=details,
+    )
 
-def _run_curl(
-    method: str,
-    url: str,
-    headers: dict[str, str] | None = None,
-    body: dict | None = None,
-    timeout: int = 30,
-) -> _CurlResponse:
-    """
-    Execute a single curl request and return a _CurlResponse.
-    Runs synchronously — call via asyncio.to_thread() from async code.
 
-    Raises:
-        SourceAPITimeoutException:    curl exit code 28 (operation timed out).
-        SourceAPIConnectionException: curl exit code 7 (failed to connect).
-        SourceAPIException:           any other non-zero curl exit code.
+def _gateway_timeout(source: str, status: int, details: dict[str, Any]) -> AppException:
+    return SourceAPITimeoutException(
+        message=f"{source} gateway timed out ({status}). Check network path to {source}.",
+        details=details,
+    )
+
+
+# Statuses with a dedicated exception; anything else is a SourceAPIException
+_STATUS_HANDLERS: dict[int, Callable[[str, int, dict[str, Any]], AppException]] = {
+    401: _auth_error,
+    403: _auth_error,
+    504: _gateway_timeout,
+}
+
+
+def _body_excerpt(response: httpx.Response) -> str:
+    """First 500 bytes of the body for error details, without decoding the rest."""
+    return response.content[:500].decode("utf-8", errors="replace")
+
+
+def _raise_for_status(
+    response: httpx.Response,
+    endpoint: str,
+    source: str = "SC API",
+    action: str = "",
+    ok: Container[int] = (200,),
+) -> None:
     """
-    cmd = [
-        "curl",
-        "--insecure",          # disable SSL cert validation (internal certs)
-        "--silent",
-        "--show-error",
-        "--max-time", str(timeout),
-        "--request", method.upper(),
-        "--url", url,
-        "--dump-header", "-",  # write response headers to stdout before body
-    ]
-
-    for key, value in (headers or {}).items():
-        cmd += ["--header", f"{key}: {value}"]
-
-    if body is not None:
-        if not headers or "Content-Type" not in headers:
-            cmd += ["--header", "Content-Type: application/json"]
-        cmd += ["--data", json.dumps(body)]
-
-    result = subprocess.run(cmd, capture_output=True, text=True)
-
-    if result.returncode != 0:
-        stderr = result.stderr.strip()
-        if result.returncode == 28:
-            raise SourceAPITimeoutException(
-                message=f"Request to {url} timed out after {timeout}s.",
-                details={"endpoint": url, "error": stderr},
-            )
-        if result.returncode == 7:
-            raise SourceAPIConnectionException(
-                details={"endpoint": url, "error": stderr},
-            )
-        raise SourceAPIException(
-            message=f"curl exited with code {result.returncode}.",
-            details={"endpoint": url, "error": stderr},
-        )
+    Raise the matching AppException unless ``response`` has an ``ok`` status.
 
-    output = result.stdout
-
-    # curl --dump-header - may include multiple HTTP response blocks when the
-    # server sends 100 Continue, 301/302 redirects, etc.  Always use the LAST
-    # complete block so we parse the final status + body, not an intermediate one.
-    #
-    # Strategy: find the last occurrence of a line that starts "HTTP/" and take
-    # everything from there as the final response block.
-    last_http_pos = max(output.rfind("\r\nHTTP/"), output.rfind("\nHTTP/"))
-    if last_http_pos != -1:
-        # Skip the leading newline character(s)
-        final_block = output[last_http_pos:].lstrip("\r\n")
-    else:
-        final_block = output
-
-    # Split the final block into header section and body
-    header_block, sep, body_text = final_block.partition("\r\n\r\n")
-    if not sep:
-        header_block, sep, body_text = final_block.partition("\n\n")
-
-    # Parse status code from the status line, e.g. "HTTP/1.1 201 Created"
-    status_code = 0
-    parsed_headers: dict[str, str] = {}
-    for line in header_block.splitlines():
-        line = line.strip()
-        if line.upper().startswith("HTTP/"):
-            try:
-                status_code = int(line.split()[1])
-            except (IndexError, ValueError):
-                pass
-        elif ": " in line:
-            k, _, v = line.partition(": ")
-            parsed_headers[k.lower()] = v
-
-    return _CurlResponse(
-        status_code=status_code,
-        headers=parsed_headers,
-        text=body_text.strip(),
+    ``source`` and ``action`` only shape the message, e.g. "SC API returned
+    HTTP 500 fetching VDCs."
+    """
+    status = response.status_code
+    if status in ok:
+        return
+    details = {"endpoint": endpoint, "status_code": status,
+               "body": _body_excerpt(response)}
+    handler = _STATUS_HANDLERS.get(status)
+    if handler is not None:
+        raise handler(source, status, details)
+    suffix = f" {action}" if action else ""
+    raise SourceAPIException(
+        message=f"{source} returned HTTP {status}{suffix}.",
+        details=details,
     )
 
 
+# ── IAM token cache ───────────────────────────────────────────────────
+
+class TokenCache:
+    """
+    Process-wide IAM token store shared by every HCSClient.
+
+    Entries are keyed by IAM user + auth domain.  ``lock`` serialises token
+    fetches on a miss so concurrent requests wait for one IAM round-trip
+    instead of each issuing their own.  ``refresh_tasks`` holds the
+    background refresh started ahead of expiry, at most one per key; it
+    never takes ``lock``.  ``refresh_retry_at`` holds when a key may try
+    again after a failed background refresh.
+    """
+
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        self.refresh_tasks: dict[str, asyncio.Task[None]] = {}
+        self.refresh_retry_at: dict[str, float] = {}
+        # key -> (token, expiry as a POSIX timestamp)
+        self._entries: dict[str, tuple[str, float]] = {}
+
+    def get(self, key: str) -> tuple[str, float] | None:
+        return self._entries.get(key)
+
+    def set(self, key: str, token: str, expires_at: float) -> None:
+        self._entries[key] = (token, expires_at)
+
+    def invalidate(self, key: str, token: str | None = None) -> None:
+        """Drop the entry for ``key`` (only if it still holds ``token``, when given)."""
+        if token is None or self._entries.get(key, (None,))[0] == token:
+            self._entries.pop(key, None)
+
+
+# ── Pagination ────────────────────────────────────────────────────────
+
+class _PageFetcher(Generic[PageT]):
+    """
+    Fetch pages by offset with bounded concurrency, yielding them in order.
+
+    Up to ``concurrency`` requests are kept in flight; each time the caller
+    takes a page, the next offset is scheduled.  ``close()`` cancels
+    whatever is still outstanding.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[int], Awaitable[PageT]],
+        offsets: Iterable[int],
+        concurrency: int,
+    ) -> None:
+        self._fetch = fetch
+        self._offsets = iter(offsets)
+        self._pending: deque[asyncio.Future[PageT]] = deque()
+        self._schedule(concurrency)
+
+    def _schedule(self, n: int) -> None:
+        for offset in islice(self._offsets, n):
+            self._pending.append(asyncio.ensure_future(self._fetch(offset)))
+
+    def __aiter__(self) -> "_PageFetcher[PageT]":
+        return self
+
+    async def __anext__(self) -> PageT:
+        if not self._pending:
+            raise StopAsyncIteration
+        task = self._pending.popleft()
+        self._schedule(1)
+        return await task
+
+    def close(self) -> None:
+        for task in self._pending:
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                task.exception()  # mark a failed page as retrieved
+        self._pending.clear()
+
+
 # ── HCS client ────────────────────────────────────────────────────────
 
 class HCSClient:
-    """curl-backed client for Huawei Cloud Stack ManageOne APIs."""
+    """httpx-backed client for Huawei Cloud Stack ManageOne APIs."""
 
     # Refresh 60 s before actual expiry to avoid races
-    _TOKEN_EXPIRY_BUFFER = timedelta(seconds=60)
-
-    def __init__(self) -> None:
+    _TOKEN_EXPIRY_BUFFER = 60.0
+    # Within this many seconds of that point, refresh in the background
+    # while requests keep using the current token
+    _TOKEN_REFRESH_AHEAD = 300.0
+    # Wait this long before another background refresh after one fails
+    _TOKEN_REFRESH_BACKOFF = 30.0
+
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient,
+        token_cache: TokenCache | None = None,
+        lookup_cache: TTLCache | None = None,
+        inflight: SingleFlight | None = None,
+    ) -> None:
+        self._http = http_client
+        self._token_cache = token_cache or TokenCache()
+        self._lookup_cache = lookup_cache or TTLCache(ttl=_LOOKUP_CACHE_TTL)
+        # Identical metrics pages requested concurrently share one SC call
+        self._inflight = inflight or SingleFlight()
         self._token: str | None = None
-        self._token_expires_at: datetime | None = None
+        self._token_expires_at: float | None = None
+        # POSIX time after which the token is treated as expired (expiry - buffer)
+        self._token_refresh_at = 0.0
+        # SC request headers for the current token, rebuilt only when it changes
+        self._auth_headers: dict[str, str] | None = None
+
+        # Settings and endpoint URLs are fixed for the client's lifetime
+        self._settings = settings = get_settings()
+        self._token_cache_key = f"{settings.iam_auth_domain}/{settings.iam_username}"
+        self._iam_token_url = f"{settings.iam_domain}/v3/auth/tokens"
+        self._regions_url = f"{settings.sc_domain}{_REGIONS_ENDPOINT}"
+        self._vdcs_url = f"{settings.sc_domain}{_VDCS_ENDPOINT}"
+        self._metrics_url = f"{settings.sc_domain}{_METRICS_ENDPOINT}"
+        self._page_concurrency = max(1, settings.sc_page_concurrency)
 
     def _is_token_valid(self) -> bool:
         """Return True if a non-expired token is cached."""
-        if not self._token or self._token_expires_at is None:
-            return False
-        return datetime.now(tz=timezone.utc) < (
-            self._token_expires_at - self._TOKEN_EXPIRY_BUFFER
+        # _token_refresh_at is 0.0 whenever there is no token
+        return time.time() < self._token_refresh_at
+
+    def _set_token(self, token: str | None, expires_at: float | None) -> None:
+        self._token, self._token_expires_at = token, expires_at
+        self._token_refresh_at = (
+            expires_at - self._TOKEN_EXPIRY_BUFFER if token and expires_at else 0.0
         )
+        if not token:
+            self._auth_headers = None
+        elif self._auth_headers is None or self._auth_headers["X-Auth-Token"] != token:
+            self._auth_headers = {
+                "X-Auth-Token": token,
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+            }
 
-    def _invalidate_token(self) -> None:
-        self._token = None
-        self._token_expires_at = None
+    def _invalidate_token(self, rejected: str | None = None) -> None:
+        """
+        Forget the current token.
+
+        With ``rejected``, only do so if that is still the current token —
+        a concurrent page request may already have refreshed it.
+        """
+        if rejected is not None and rejected != self._token:
+            return
+        token = self._token
+        self._set_token(None, None)
+        self._token_cache.invalidate(self._token_cache_key, token)
 
     def _sc_headers(self) -> dict[str, str]:
-        """Standard headers for SC Northbound API calls."""
-        assert self._token is not None
-        return {
-            "X-Auth-Token": self._token,
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        }
+        """Standard headers for SC Northbound API calls (shared; do not mutate)."""
+        assert self._auth_headers is not None
+        return self._auth_headers
 
     @staticmethod
-    def _is_login_redirect(response: _CurlResponse) -> bool:
+    def _is_login_redirect(response: httpx.Response) -> bool:
         """Detect HTML login-redirect pages the gateway returns for unauthed requests."""
-        return (
-            _LOGIN_REDIRECT_MARKER in response.text
-            or response.text.lstrip().startswith("<")
-        )
+        # Work on the raw bytes: decoding .text would copy the whole page
+        body = response.content
+        match = _BODY_START_RE.match(body)
+        first = match.group(1) if match else b""
+        if first in (b"{", b"["):
+            # JSON page: skip the full-body marker scan on the hot path
+            return False
+        return first == b"<" or _LOGIN_REDIRECT_MARKER in body
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        body: dict | bytes | None = None,
+    ) -> httpx.Response:
+        """
+        Issue a single request over the pooled HTTP client.
+
+        A dict ``body`` is encoded with orjson; bytes are sent as-is (already
+        JSON).  Either way ``headers`` must carry the JSON Content-Type.
+
+        Raises:
+            SourceAPITimeoutException:    the request timed out.
+            SourceAPIConnectionException: the host could not be reached.
+            SourceAPIException:           any other transport-level failure.
+        """
+        try:
+            if body is not None and not isinstance(body, bytes):
+                body = orjson.dumps(body)
+            return await self._http.request(method, url, headers=headers, content=body)
+        except httpx.TimeoutException as exc:
+            raise SourceAPITimeoutException(
+                message=f"Request to {url} timed out.",
+                details={"endpoint": url, "error": str(exc)},
+            ) from exc
+        except httpx.ConnectError as exc:
+            raise SourceAPIConnectionException(
+                details={"endpoint": url, "error": str(exc)},
+            ) from exc
+        except httpx.HTTPError as exc:
+            raise SourceAPIException(
+                message=f"HTTP request to {url} failed.",
+                details={"endpoint": url, "error": str(exc)},
+            ) from exc
+
+    async def _send_with_retry(
+        self,
+        method: str,
+        url: str,
+        body: dict | bytes | None = None,
+        endpoint: str | None = None,
+    ) -> httpx.Response:
+        """
+        Issue an authenticated SC request, re-authenticating once on rejection.
+
+        A 401 or a login-redirect page triggers one token refresh and one
+        retry.  ``endpoint`` is the URL reported in error details (defaults
+        to ``url``).
+
+        Raises:
+            AuthenticationException: the retry was also redirected to login.
+        """
+        if not self._is_token_valid():
+            await self.authenticate()
+        # Also after authenticate(): a per-request client adopts the shared
+        # token there, possibly already inside the refresh window
+        if time.time() >= self._token_refresh_at - self._TOKEN_REFRESH_AHEAD:
+            self._schedule_token_refresh()
+
+        headers = self._sc_headers()
+        response = await self._send(method, url, headers=headers, body=body)
+
+        if response.status_code == 401 or self._is_login_redirect(response):
+            self._invalidate_token(headers["X-Auth-Token"])
+            await self.authenticate()
+            response = await self._send(
+                method, url, headers=self._sc_headers(), body=body,
+            )
+
+        if self._is_login_redirect(response):
+            raise AuthenticationException(
+                message="SC API returned login redirect after re-auth. Token not accepted.",
+                details={"endpoint": endpoint or url, "raw_body": _body_excerpt(response)},
+            )
+        return response
 
     # ── Authentication ────────────────────────────────────────────────
 
     async def authenticate(self) -> str:
+        """
+        Return a valid admin token, from the shared cache when possible.
+
+        Only hits IAM when no unexpired token is cached for this user.  A
+        cached token is read without the lock, so requests only queue on it
+        while a token actually has to be fetched.
+        """
+        if self._use_cached_token():
+            return self._token
+
+        async with self._token_cache.lock:
+            # Another request may have fetched one while we waited
+            if self._use_cached_token():
+                return self._token
+
+            token = await self._request_token()
+            assert self._token_expires_at is not None
+            self._token_cache.set(self._token_cache_key, token, self._token_expires_at)
+            return token
+
+    def _use_cached_token(self) -> bool:
+        """Adopt the shared cache's token; return True if it is still valid."""
+        cached = self._token_cache.get(self._token_cache_key)
+        if cached is None:
+            return False
+        self._set_token(*cached)
+        return self._is_token_valid()
+
+    def _schedule_token_refresh(self) -> None:
+        """Start a background IAM refresh unless one is running or backing off."""
+        tasks = self._token_cache.refresh_tasks
+        key = self._token_cache_key
+        if key in tasks or time.time() < self._token_cache.refresh_retry_at.get(key, 0.0):
+            return
+        task = asyncio.create_task(self._refresh_token_ahead())
+        tasks[key] = task
+        task.add_done_callback(lambda _: tasks.pop(key, None))
+
+    async def _refresh_token_ahead(self) -> None:
+        """
+        Replace a soon-to-expire token without making any request wait on IAM.
+
+        Runs outside ``TokenCache.lock`` (``refresh_tasks`` already keeps it
+        to one per key), so requests keep reading the current token.
+        Failures are logged and back off for ``_TOKEN_REFRESH_BACKOFF``
+        seconds: the current token stays in use, and the normal path
+        re-authenticates once it actually expires.
+        """
+        cache = self._token_cache
+        key = self._token_cache_key
+        cached = cache.get(key)
+        if cached is not None and time.time() < (
+            cached[1] - self._TOKEN_EXPIRY_BUFFER - self._TOKEN_REFRESH_AHEAD
+        ):
+            # Another client already refreshed it
+            self._set_token(*cached)
+            return
+        try:
+            token = await self._request_token()
+        except Exception:
+            cache.refresh_retry_at[key] = time.time() + self._TOKEN_REFRESH_BACKOFF
+            logger.warning("Background IAM token refresh failed.", exc_info=True)
+            return
+        assert self._token_expires_at is not None
+        cache.set(key, token, self._token_expires_at)
+        cache.refresh_retry_at.pop(key, None)
+
+    async def _request_token(self) -> str:
         """
         Obtain an admin token from the IAM endpoint.
 
         POST https://{IAM_DOMAIN}/v3/auth/tokens
         """
-        settings = get_settings()
-        url = f"{settings.iam_domain}/v3/auth/tokens"
+        settings = self._settings
+        url = self._iam_token_url
 
         body = {
             "auth": {
@@ -223,30 +464,13 @@ class HCSClient:
 
         logger.info("Authenticating with HCS IAM", extra={"url": url})
 
-        response = await asyncio.to_thread(
-            _run_curl, "POST", url,
-            headers={"Accept": "application/json"},
+        response = await self._send(
+            "POST", url,
+            headers=_IAM_HEADERS,
             body=body,
-            timeout=settings.sc_api_timeout,
         )
 
-        status = response.status_code
-        if status in (401, 403):
-            raise AuthenticationException(
-                message=f"IAM authentication rejected (HTTP {status}).",
-                details={"url": url, "body": response.text[:500]},
-            )
-        if status == 504:
-            raise SourceAPITimeoutException(
-                message="IAM gateway timed out (504). Check network path to IAM.",
-                details={"url": url, "body": response.text[:500]},
-            )
-        if status not in (200, 201):
-            raise SourceAPIException(
-                message=f"IAM endpoint returned HTTP {status}.",
-                details={"url": url, "status_code": status,
-                         "body": response.text[:500]},
-            )
+        _raise_for_status(response, url, source="IAM", ok=(200, 201))
 
         token = response.headers.get("x-subject-token", "")
         if not token:
@@ -254,15 +478,16 @@ class HCSClient:
                 message="IAM response missing X-Subject-Token header.",
             )
 
-        self._token = token
+        self._set_token(token, time.time() + _DEFAULT_TOKEN_TTL)
 
         # Parse expiry and user info from the response body
         try:
-            token_data = response.json().get("token", {})
+            token_data = orjson.loads(response.content).get("token", {})
             expires_at_str = token_data.get("expires_at", "")
             if expires_at_str:
-                self._token_expires_at = datetime.fromisoformat(
-                    expires_at_str.replace("Z", "+00:00")
+                # fromisoformat accepts the trailing "Z" natively (3.11+)
+                self._set_token(
+                    token, datetime.fromisoformat(expires_at_str).timestamp()
                 )
             user = token_data.get("user", {})
             logger.info(
@@ -281,49 +506,30 @@ class HCSClient:
     # ── Regions ───────────────────────────────────────────────────────
 
     async def fetch_regions(self) -> list[HCSRegion]:
+        """
+        Return all regions, served from the lookup cache when fresh.
+        """
+        return await self._lookup_cache.get_or_set(
+            ("regions",), self._fetch_regions_uncached,
+            ttl=self._settings.regions_cache_ttl,
+        )
+
+    async def _fetch_regions_uncached(self) -> list[HCSRegion]:
         """
         Return all regions from the SC Northbound Interface.
 
         GET https://{SC_DOMAIN}/silvan/rest/v1.0/regions
         """
-        if not self._is_token_valid():
-            await self.authenticate()
-
-        assert self._token is not None
-
-        settings = get_settings()
-        url = f"{settings.sc_domain}{_REGIONS_ENDPOINT}"
+        url = self._regions_url
 
         logger.info("Fetching HCS regions", extra={"url": url})
 
-        response = await asyncio.to_thread(
-            _run_curl, "GET", url,
-            headers=self._sc_headers(),
-            timeout=settings.sc_api_timeout,
-        )
+        response = await self._send_with_retry("GET", url)
 
-        if response.status_code == 401 or self._is_login_redirect(response):
-            self._invalidate_token()
-            await self.authenticate()
-            response = await asyncio.to_thread(
-                _run_curl, "GET", url,
-                headers=self._sc_headers(),
-                timeout=settings.sc_api_timeout,
-            )
-
-        if self._is_login_redirect(response):
-            raise AuthenticationException(
-                message="SC API returned login redirect after re-auth. Token not accepted.",
-                details={"endpoint": url, "raw_body": response.text[:500]},
-            )
-        if response.status_code != 200:
-            raise SourceAPIException(
-                message=f"SC API returned {response.status_code} fetching regions.",
-                details={"endpoint": url, "body": response.text[:500]},
-            )
+        _raise_for_status(response, url, action="fetching regions")
 
         try:
-            regions_response = HCSRegionsResponse(**response.json())
+            regions_response = HCSRegionsResponse.model_validate_json(response.content)
         except Exception as exc:
             raise SourceAPIException(
                 message="Failed to parse regions response.",
@@ -343,77 +549,80 @@ class HCSClient:
         limit: int = 1000,
     ) -> list[HCSVDC]:
         """
-        Return VDCs (tenants) from the SC Northbound Interface, auto-paginating.
+        Return VDCs (tenants), served from the lookup cache when fresh.
 
-        GET https://{SC_DOMAIN}/rest/vdc/v3.0/vdcs
+        Cached per (level, is_domain, limit) combination.
         """
-        if not self._is_token_valid():
-            await self.authenticate()
-
-        assert self._token is not None
-
-        settings = get_settings()
-        base_url = f"{settings.sc_domain}{_VDCS_ENDPOINT}"
-
-        all_vdcs: list[HCSVDC] = []
-        start = 0
-
-        while True:
-            params: dict[str, Any] = {"start": start, "limit": limit}
-            if level is not None:
-                params["level"] = level
-            if is_domain is not None:
-                params["is_domain"] = is_domain
-
-            url = f"{base_url}?{urlencode(params)}"
+        return await self._lookup_cache.get_or_set(
+            ("vdcs", level, is_domain, limit),
+            lambda: self._fetch_vdcs_uncached(level, is_domain, limit),
+            ttl=self._settings.vdcs_cache_ttl,
+        )
 
-            logger.info("Fetching HCS VDC page",
-                        extra={"url": base_url, "start": start, "limit": limit})
+    async def _fetch_vdcs_uncached(
+        self,
+        level: int | None = None,
+        is_domain: str | None = None,
+        limit: int = 1000,
+    ) -> list[HCSVDC]:
+        """
+        Return VDCs (tenants) from the SC Northbound Interface, auto-paginating.
 
-            response = await asyncio.to_thread(
-                _run_curl, "GET", url,
-                headers=self._sc_headers(),
-                timeout=settings.sc_api_timeout,
+        GET https://{SC_DOMAIN}/rest/vdc/v3.0/vdcs
+        """
+        base_url = self._vdcs_url
+
+        # Only "start" differs between pages; encode the rest once
+        static_qs = urlencode({
+            k: v for k, v in (("limit", limit), ("level", level), ("is_domain", is_domain))
+            if v is not None
+        })
+
+        first = await self._fetch_vdcs_page(base_url, 0, static_qs)
+        all_vdcs: list[HCSVDC] = list(first.vdcs)
+        page_count = 1
+
+        # Once the first page reports the total, request the rest concurrently
+        if first.vdcs and first.total > limit:
+            pages = _PageFetcher(
+                lambda start: self._fetch_vdcs_page(base_url, start, static_qs),
+                range(limit, first.total, limit),
+                self._page_concurrency,
             )
+            try:
+                async for vdcs_response in pages:
+                    if not vdcs_response.vdcs:
+                        break
+                    all_vdcs.extend(vdcs_response.vdcs)
+                    page_count += 1
+            finally:
+                pages.close()
+
+        logger.info("HCS VDCs fetched",
+                    extra={"vdc_count": len(all_vdcs), "page_count": page_count})
+        return all_vdcs
 
-            if response.status_code == 401 or self._is_login_redirect(response):
-                self._invalidate_token()
-                await self.authenticate()
-                response = await asyncio.to_thread(
-                    _run_curl, "GET", url,
-                    headers=self._sc_headers(),
-                    timeout=settings.sc_api_timeout,
-                )
+    async def _fetch_vdcs_page(
+        self, base_url: str, start: int, static_qs: str
+    ) -> HCSVDCsResponse:
+        """GET a single VDC list page; ``static_qs`` holds every param but start."""
+        url = f"{base_url}?start={start}&{static_qs}"
 
-            if self._is_login_redirect(response):
-                raise AuthenticationException(
-                    message="SC API returned login redirect after re-auth. Token not accepted.",
-                    details={"endpoint": base_url,
-                             "raw_body": response.text[:500]},
-                )
-            if response.status_code != 200:
-                raise SourceAPIException(
-                    message=f"SC API returned {response.status_code} fetching VDCs.",
-                    details={"endpoint": base_url,
-                             "body": response.text[:500]},
-                )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Fetching HCS VDC page",
+                         extra={"url": base_url, "start": start})
 
-            try:
-                vdcs_response = HCSVDCsResponse(**response.json())
-            except Exception as exc:
-                raise SourceAPIException(
-                    message="Failed to parse VDC list response.",
-                    details={"endpoint": base_url, "error": str(exc)},
-                ) from exc
-
-            all_vdcs.extend(vdcs_response.vdcs)
+        response = await self._send_with_retry("GET", url, endpoint=base_url)
 
-            if len(all_vdcs) >= vdcs_response.total or not vdcs_response.vdcs:
-                break
-            start += limit
+        _raise_for_status(response, base_url, action="fetching VDCs")
 
-        logger.info("HCS VDCs fetched", extra={"vdc_count": len(all_vdcs)})
-        return all_vdcs
+        try:
+            return HCSVDCsResponse.model_validate_json(response.content)
+        except Exception as exc:
+            raise SourceAPIException(
+                message="Failed to parse VDC list response.",
+                details={"endpoint": base_url, "error": str(exc)},
+            ) from exc
 
     # ── Metrics Query ─────────────────────────────────────────────────
 
@@ -432,110 +641,150 @@ class HCSClient:
         """
         Query cloud service CDRs from the SC Northbound Interface, auto-paginating.
 
-        POST https://{SC_DOMAIN}/rest/metering/v3.0/query-metrics-data
+        Collects every page from :meth:`iter_metrics` into a single list.
         """
-        if not self._is_token_valid():
-            await self.authenticate()
+        all_records: list[HCSMetricRecord] = []
+        async for page in self.iter_metrics(
+            region_code=region_code,
+            domain_id=domain_id,
+            start_time=start_time,
+            end_time=end_time,
+            resource_type_code=resource_type_code,
+            period=period,
+            time_zone=time_zone,
+            locale=locale,
+            limit=limit,
+        ):
+            all_records.extend(page)
+        return all_records
 
-        assert self._token is not None
+    async def iter_metrics(
+        self,
+        region_code: str,
+        domain_id: str,
+        start_time: str,
+        end_time: str,
+        resource_type_code: str | None = None,
+        period: str = "daily",
+        time_zone: str = "Africa/Lagos",
+        locale: str = "en_US",
+        limit: int | None = None,
+    ) -> AsyncGenerator[list[HCSMetricRecord], None]:
+        """
+        Query cloud service CDRs page by page, yielding each page as it arrives.
 
-        settings = get_settings()
-        url = f"{settings.sc_domain}{_METRICS_ENDPOINT}"
+        POST https://{SC_DOMAIN}/rest/metering/v3.0/query-metrics-data
+        """
+        url = self._metrics_url
+
+        # Only "start" differs between pages; build the rest once per query
+        base_body: dict[str, Any] = {
+            "region_code": region_code,
+            "start_time": start_time,
+            "end_time": end_time,
+            "time_zone": time_zone,
+            "period": period,
+            "locale": locale,
+            "domain_id": domain_id,
+        }
+        if resource_type_code:
+            base_body["resource_type_code"] = resource_type_code
+        if limit is not None:
+            base_body["limit"] = limit
+
+        # Encode the fixed fields once; each page splices its offset in as the
+        # last key, so building a page body is a single bytes format
+        body_prefix = orjson.dumps(base_body)[:-1] + b',"start":'
+
+        def fetch_page(start: int) -> Awaitable[HCSMetricsResponse | None]:
+            body = b"%s%d}" % (body_prefix, start)
+            # The encoded body fully identifies the page, so it is the key
+            return self._inflight.run(
+                (url, body),
+                lambda: self._fetch_metrics_page(url, body, start, base_body),
+            )
 
-        all_records: list[HCSMetricRecord] = []
+        record_count = 0
+        page_count = 0
         total_reported = 0
-        start = 0
-
-        while True:
-            body: dict[str, Any] = {
-                "region_code": region_code,
-                "start_time": start_time,
-                "end_time": end_time,
-                "time_zone": time_zone,
-                "period": period,
-                "locale": locale,
-                "domain_id": domain_id,
-                "start": start,
-            }
-            if resource_type_code:
-                body["resource_type_code"] = resource_type_code
-            if limit is not None:
-                body["limit"] = limit
+        pages: _PageFetcher[HCSMetricsResponse | None] | None = None
 
-            logger.info(
+        try:
+            metrics_response = await fetch_page(0)
+            if metrics_response is not None and metrics_response.metrics:
+                page = metrics_response.metrics
+                total_reported = metrics_response.total
+                # Default SC API page size is 20 when limit is not specified
+                step = limit if limit is not None else len(page)
+                # Start the remaining pages before handing this one over, so
+                # their round-trips overlap with each other and with the caller
+                pages = _PageFetcher(
+                    fetch_page, range(step, total_reported, step), self._page_concurrency,
+                )
+                record_count += len(page)
+                page_count += 1
+                yield page
+
+                async for metrics_response in pages:
+                    if metrics_response is None or not metrics_response.metrics:
+                        break
+                    record_count += len(metrics_response.metrics)
+                    page_count += 1
+                    yield metrics_response.metrics
+        finally:
+            # Caller stopped early or a page failed: don't leave fetches running
+            if pages is not None:
+                pages.close()
+
+        logger.info(
+            "HCS metrics fetch complete",
+            extra={"record_count": record_count, "page_count": page_count,
+                   "total": total_reported},
+        )
+
+    async def _fetch_metrics_page(
+        self, url: str, body: bytes, start: int, query: dict[str, Any]
+    ) -> HCSMetricsResponse | None:
+        """
+        POST a single query-metrics-data page.
+
+        ``body`` is the encoded request for offset ``start``; ``query`` holds
+        the same fields as a dict, for logging.
+
+        Returns None when the SC API answers 200 with an empty body.
+        """
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
                 "Fetching HCS metrics page",
                 extra={
                     "url": url,
-                    "region": region_code,
-                    "resource_type": resource_type_code,
+                    "region": query["region_code"],
+                    "resource_type": query.get("resource_type_code"),
                     "start": start,
-                    "limit": limit,
+                    "limit": query.get("limit"),
                 },
             )
 
-            response = await asyncio.to_thread(
-                _run_curl, "POST", url,
-                headers=self._sc_headers(),
-                body=body,
-                timeout=settings.sc_api_timeout,
-            )
+        response = await self._send_with_retry("POST", url, body=body)
 
-            if response.status_code == 401 or self._is_login_redirect(response):
-                self._invalidate_token()
-                await self.authenticate()
-                response = await asyncio.to_thread(
-                    _run_curl, "POST", url,
-                    headers=self._sc_headers(),
-                    body=body,
-                    timeout=settings.sc_api_timeout,
-                )
+        _raise_for_status(response, url, action="fetching metrics")
 
-            if self._is_login_redirect(response):
-                raise AuthenticationException(
-                    message="SC API returned login redirect after re-auth. Token not accepted.",
-                    details={"endpoint": url, "raw_body": response.text[:500]},
-                )
-            if response.status_code != 200:
-                raise SourceAPIException(
-                    message=f"SC API returned {response.status_code}.",
-                    details={
-                        "endpoint": url,
-                        "status_code": response.status_code,
-                        "body": response.text[:500],
-                    },
-                )
-
-            # A 200 with an empty body means no records for this query
-            if not response.text:
-                logger.warning(
-                    "SC API returned 200 with empty body — treating as zero records",
-                    extra={"endpoint": url, "start": start},
-                )
-                break
-
-            try:
-                metrics_response = HCSMetricsResponse(**response.json())
-            except Exception as exc:
-                raise SourceAPIException(
-                    message="Failed to parse SC API metrics response.",
-                    details={
-                        "endpoint": url,
-                        "error": str(exc),
-                        "raw_body": response.text[:500],
-                    },
-                ) from exc
-
-            all_records.extend(metrics_response.metrics)
-            total_reported = metrics_response.total
-
-            if len(all_records) >= total_reported or not metrics_response.metrics:
-                break
-            # Default SC API page size is 20 when limit is not specified
-            start += limit if limit is not None else len(
-                metrics_response.metrics)
+        # A 200 with an empty (or whitespace-only) body means no records
+        if not response.content.strip():
+            logger.warning(
+                "SC API returned 200 with empty body — treating as zero records",
+                extra={"endpoint": url, "start": start},
+            )
+            return None
 
-        logger.info(
-            "HCS metrics fetch complete",
-            extra={"record_count": len(all_records), "total": total_reported},
-        )
-        return all_records
+        try:
+            return HCSMetricsResponse.model_validate_json(response.content)
+        except Exception as exc:
+            raise SourceAPIException(
+                message="Failed to parse SC API metrics response.",
+                details={
+                    "endpoint": url,
+                    "error": str(exc),
+                    "raw_body": _body_excerpt(response),
+                },
+            ) from exc
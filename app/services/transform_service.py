@@ -5,6 +5,9 @@ This is the primary business-logic layer, composing the HCS client
 and the FOCUS mapper into a single operation.
 """
 
+import asyncio
+from itertools import product
+
 from app.core.logging import get_logger
 from app.mappers.focus_mapper import FocusMapper
 from app.schemas.focus_schema import FocusRecord, FocusResponse
@@ -12,13 +15,17 @@ from app.services.source_client import HCSClient
 
 logger = get_logger(__name__)
 
+# Max (region, domain, resource_type) queries in flight in transform_many.
+# Each one paginates with up to sc_page_concurrency (default 8) requests of
+# its own, so 16 x 8 stays inside the shared client's 200-connection pool.
+_FANOUT_CONCURRENCY = 16
+
 
 class TransformService:
     """Fetch HCS metering data, transform it to FOCUS, and return."""
 
     def __init__(self, hcs_client: HCSClient) -> None:
         self._hcs_client = hcs_client
-        self._mapper = FocusMapper()
 
     async def transform(
         self,
@@ -66,8 +73,20 @@ class TransformService:
             },
         )
 
-        # 1. Fetch HCS metrics
-        hcs_records = await self._hcs_client.fetch_metrics(
+        # 1. Mapper for this call's tenant/VDC context.  Kept local so
+        #    concurrent transform() calls never share it.
+        mapper = FocusMapper(
+            tenant_name=tenant_name,
+            tenant_id=tenant_id,
+            vdc_name=vdc_name,
+            vdc_id=vdc_id,
+        )
+
+        # 2. Fetch HCS metrics and map each page to FOCUS as it arrives, so
+        #    the raw records never accumulate into one list
+        focus_records: list[FocusRecord] = []
+        source_count = 0
+        async for page in self._hcs_client.iter_metrics(
             region_code=region_code,
             domain_id=domain_id,
             start_time=start_time,
@@ -77,28 +96,19 @@ class TransformService:
             time_zone=time_zone,
             locale=locale,
             limit=limit,
-        )
-
-        # 2. Configure mapper with tenant/VDC context
-        self._mapper = FocusMapper(
-            tenant_name=tenant_name,
-            tenant_id=tenant_id,
-            vdc_name=vdc_name,
-            vdc_id=vdc_id,
-        )
-
-        # 3. Map to FOCUS
-        focus_records: list[FocusRecord] = self._mapper.map_many(hcs_records)
+        ):
+            source_count += len(page)
+            focus_records.extend(mapper.map_many(page))
 
         logger.info(
             "Transform pipeline complete",
             extra={
-                "source_count": len(hcs_records),
+                "source_count": source_count,
                 "focus_count": len(focus_records),
             },
         )
 
-        # 4. Return
+        # 3. Return
         return FocusResponse(
             status="ok",
             total_count=len(focus_records),
@@ -112,3 +122,63 @@ class TransformService:
                 "end_time": end_time,
             },
         )
+
+    async def transform_many(
+        self,
+        region_codes: list[str],
+        domain_ids: list[str],
+        start_time: str,
+        end_time: str,
+        resource_type_codes: list[str | None] | None = None,
+        period: str = "daily",
+        time_zone: str = "Africa/Lagos",
+        locale: str = "en_US",
+        limit: int | None = None,
+        tenant_name: str = "",
+        tenant_id: str = "",
+        vdc_name: str = "",
+        vdc_id: str = "",
+        concurrency: int = _FANOUT_CONCURRENCY,
+    ) -> list[FocusResponse]:
+        """
+        Run :meth:`transform` for every region x domain x resource type.
+
+        The queries are independent, so up to ``concurrency`` of them run at
+        once.  Results come back in ``itertools.product`` order.  The first
+        failure cancels the remaining queries and propagates, as with
+        :meth:`transform`.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(
+            region_code: str, domain_id: str, resource_type_code: str | None
+        ) -> FocusResponse:
+            async with semaphore:
+                return await self.transform(
+                    region_code=region_code,
+                    domain_id=domain_id,
+                    start_time=start_time,
+                    end_time=end_time,
+                    resource_type_code=resource_type_code,
+                    period=period,
+                    time_zone=time_zone,
+                    locale=locale,
+                    limit=limit,
+                    tenant_name=tenant_name,
+                    tenant_id=tenant_id,
+                    vdc_name=vdc_name,
+                    vdc_id=vdc_id,
+                )
+
+        combos = product(region_codes, domain_ids, resource_type_codes or [None])
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tasks = [tg.create_task(run(*combo)) for combo in combos]
+        except ExceptionGroup as group:
+            # Re-raise the first failure itself, not the group, so callers
+            # and the API error handlers see the usual exception types.
+            # Raised outside the handler to keep its own __cause__ chain.
+            error = group.exceptions[0]
+        else:
+            return [task.result() for task in tasks]
+        raise error
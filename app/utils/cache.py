@@ -0,0 +1,161 @@
+"""
+Small in-memory async caches.
+
+TTLCache serves slow-changing upstream lookups (HCS regions, VDC lists)
+from RAM instead of re-fetching them on every request.  SingleFlight
+shares one in-flight upstream call between identical concurrent callers.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class TTLCache:
+    """
+    Key → value store whose entries expire ``ttl`` seconds after being set.
+
+    Concurrent misses on the same key are coalesced: one caller runs the
+    factory while the others wait on a per-key lock and reuse its result.
+    Cached values are shared between callers and must be treated as read-only.
+
+    With ``stale_ttl``, an entry up to that many seconds past expiry is still
+    returned immediately while one background task re-runs the factory
+    (stale-while-revalidate); only older entries make the caller wait.
+
+    At most ``max_entries`` keys are kept; storing beyond that evicts the
+    least recently used.  Per-key locks live only while a fill is running.
+    """
+
+    def __init__(
+        self, ttl: float = 300.0, stale_ttl: float = 0.0, max_entries: int = 1024,
+    ) -> None:
+        self._ttl = ttl
+        self._stale_ttl = stale_ttl
+        self._max_entries = max(1, max_entries)
+        # Insertion order doubles as recency order (most recent last)
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._locks: dict[Hashable, asyncio.Lock] = {}
+        self._refreshing: dict[Hashable, asyncio.Task[None]] = {}
+
+    def _lookup(self, key: Hashable) -> tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            return True, entry[1]
+        return False, None
+
+    async def get_or_set(
+        self,
+        key: Hashable,
+        factory: Callable[[], Awaitable[Any]],
+        ttl: float | None = None,
+    ) -> Any:
+        """Return the cached value for ``key``, awaiting ``factory()`` on a miss."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            now = time.monotonic()
+            if entry[0] > now:
+                self._entries.move_to_end(key)
+                return entry[1]
+            if entry[0] + self._stale_ttl > now:
+                self._entries.move_to_end(key)
+                self._revalidate(key, factory, ttl)
+                return entry[1]
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                hit, value = self._lookup(key)
+                if hit:
+                    return value
+                value = await factory()
+                self._store(key, value, ttl)
+                return value
+        finally:
+            self._release_lock(key, lock)
+
+    def _store(self, key: Hashable, value: Any, ttl: float | None) -> None:
+        expires_at = time.monotonic() + (self._ttl if ttl is None else ttl)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def _release_lock(self, key: Hashable, lock: asyncio.Lock) -> None:
+        """Forget ``key``'s lock once nobody holds it, so locks don't pile up."""
+        # Later callers find the stored entry first; after a failed fill a
+        # new caller may start its own attempt alongside a queued waiter.
+        if not lock.locked() and self._locks.get(key) is lock:
+            del self._locks[key]
+
+    def _revalidate(
+        self,
+        key: Hashable,
+        factory: Callable[[], Awaitable[Any]],
+        ttl: float | None,
+    ) -> None:
+        """Refresh ``key`` in the background unless a refresh is already running."""
+        if key in self._refreshing:
+            return
+
+        async def refresh() -> None:
+            lock = self._locks.setdefault(key, asyncio.Lock())
+            try:
+                async with lock:
+                    self._store(key, await factory(), ttl)
+            finally:
+                self._release_lock(key, lock)
+
+        task = asyncio.create_task(refresh())
+        self._refreshing[key] = task
+        task.add_done_callback(lambda t: self._revalidated(key, t))
+
+    def _revalidated(self, key: Hashable, task: asyncio.Task[None]) -> None:
+        self._refreshing.pop(key, None)
+        if not task.cancelled() and (exc := task.exception()) is not None:
+            # Keep serving the stale value; the next caller will retry
+            logger.warning("Background cache refresh failed",
+                           extra={"key": repr(key)}, exc_info=exc)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one awaitable.
+
+    The first caller for a key starts ``factory()``; callers arriving while
+    it runs await the same result (or exception).  Nothing is kept once it
+    finishes.  The shared call is cancelled only when every caller waiting
+    on it has been cancelled.  Results are shared and must be treated as
+    read-only.
+    """
+
+    def __init__(self) -> None:
+        # key -> (task, number of callers awaiting it)
+        self._calls: dict[Hashable, list[Any]] = {}
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        call = self._calls.get(key)
+        if call is None:
+            task = asyncio.ensure_future(factory())
+            call = self._calls[key] = [task, 0]
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        task = call[0]
+        call[1] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if call[1] == 1:
+                task.cancel()
+            raise
+        finally:
+            call[1] -= 1
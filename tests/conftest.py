@@ -1,35 +1,114 @@
 """
 Pytest configuration & shared fixtures.
+
+The FastAPI app and its ASGI test client are built once per session; the
+function-scoped ``app`` fixture resets ``app.state`` so every test still
+starts with a fresh HTTP client slot and empty token / lookup caches.
+
+HCSClient tests share one MockTransport-backed AsyncClient whose handler
+is swapped per test through ``make_client``.
 """
 
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from typing import Any
 
 import httpx
+import orjson
+import pytest
 import pytest_asyncio
 from fastapi import FastAPI
 
-from app.main import create_app
+from app.main import create_app, create_http_client
+from app.services.source_client import HCSClient, TokenCache
+from app.utils.cache import SingleFlight, TTLCache
 
+MockHandler = Callable[[httpx.Request], httpx.Response | Awaitable[httpx.Response]]
 
-@pytest_asyncio.fixture
-async def app() -> AsyncIterator[FastAPI]:
-    """Provide a fresh FastAPI app with lifespan managed."""
+
+def iam_ok(token: str = "test-token", expires_at: str | None = None) -> httpx.Response:
+    """
+    A successful IAM token reply for mock handlers.
+
+    Built fresh per call: httpx binds a Response to the request it answers.
+    """
+    body = b"{}" if expires_at is None else orjson.dumps({"token": {"expires_at": expires_at}})
+    return httpx.Response(201, content=body, headers={"X-Subject-Token": token})
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def shared_app() -> AsyncIterator[FastAPI]:
+    """
+    Build the FastAPI app once, with a default upstream HTTP client.
+
+    The default client comes from ``create_http_client`` so it carries the
+    same HTTP/2 and pool limits as the lifespan's; tests that hit the
+    upstream swap in a MockTransport.
+    """
     application = create_app()
 
-    # Manually trigger lifespan so app.state.http_client is set
-    async with httpx.AsyncClient(
-        base_url="http://fake-source",
-        timeout=httpx.Timeout(5),
-    ) as mock_http:
-        application.state.http_client = mock_http
+    async with create_http_client() as default_http:
+        application.state.default_http_client = default_http
         yield application
 
 
-@pytest_asyncio.fixture
-async def client(app: FastAPI) -> AsyncIterator[httpx.AsyncClient]:
-    """Provide an async test client."""
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def shared_client(shared_app: FastAPI) -> AsyncIterator[httpx.AsyncClient]:
+    """One ASGI test client for the whole session."""
     async with httpx.AsyncClient(
-        transport=httpx.ASGITransport(app=app),
+        transport=httpx.ASGITransport(app=shared_app),
         base_url="http://testserver",
     ) as ac:
         yield ac
+
+
+@pytest_asyncio.fixture
+async def app(shared_app: FastAPI) -> AsyncIterator[FastAPI]:
+    """Provide the app with per-test state, as the lifespan would set it up."""
+    state = shared_app.state
+    state.http_client = state.default_http_client
+    state.token_cache = TokenCache()
+    state.lookup_cache = TTLCache()
+    state.inflight = SingleFlight()
+    yield shared_app
+
+
+@pytest_asyncio.fixture
+async def client(
+    app: FastAPI, shared_client: httpx.AsyncClient
+) -> AsyncIterator[httpx.AsyncClient]:
+    """Provide the async test client (state already reset via ``app``)."""
+    yield shared_client
+
+
+class MockUpstream:
+    """A single mock IAM / SC upstream whose request handler tests swap in."""
+
+    def __init__(self) -> None:
+        self.handler: MockHandler | None = None
+        self.http = httpx.AsyncClient(transport=httpx.MockTransport(self._dispatch))
+
+    def _dispatch(self, request: httpx.Request) -> httpx.Response | Awaitable[httpx.Response]:
+        assert self.handler is not None, "test did not set a mock handler"
+        return self.handler(request)
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def mock_upstream() -> AsyncIterator[MockUpstream]:
+    upstream = MockUpstream()
+    async with upstream.http:
+        yield upstream
+
+
+@pytest.fixture
+def make_client(mock_upstream: MockUpstream) -> Iterator[Callable[..., HCSClient]]:
+    """
+    Return ``make(handler, **kwargs)``: route upstream calls to ``handler``
+    and build a fresh HCSClient (own caches unless passed in ``kwargs``).
+    """
+
+    def make(handler: MockHandler, **kwargs: Any) -> HCSClient:
+        mock_upstream.handler = handler
+        return HCSClient(http_client=mock_upstream.http, **kwargs)
+
+    yield make
+    mock_upstream.handler = None
@@ -0,0 +1,65 @@
+"""
+Tests for the in-memory async caches.
+"""
+
+import asyncio
+
+import pytest
+
+from app.utils.cache import TTLCache
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_served_while_refreshing() -> None:
+    """An expired entry inside stale_ttl should be returned, then replaced."""
+    cache = TTLCache(ttl=0.01, stale_ttl=60.0)
+    values = iter(["v1", "v2"])
+
+    async def factory() -> str:
+        return next(values)
+
+    assert await cache.get_or_set("k", factory) == "v1"
+    await asyncio.sleep(0.02)
+
+    # Expired: the stale value comes back at once, the refresh runs behind it
+    assert await cache.get_or_set("k", factory) == "v1"
+    await asyncio.sleep(0)
+    assert await cache.get_or_set("k", factory) == "v2"
+
+
+@pytest.mark.asyncio
+async def test_expired_entry_refetched_without_stale_ttl() -> None:
+    """With no stale window an expired entry should be a plain miss."""
+    cache = TTLCache(ttl=0.01)
+    values = iter(["v1", "v2"])
+
+    async def factory() -> str:
+        return next(values)
+
+    assert await cache.get_or_set("k", factory) == "v1"
+    await asyncio.sleep(0.02)
+    assert await cache.get_or_set("k", factory) == "v2"
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_entry_evicted_past_max_entries() -> None:
+    """Storing beyond max_entries should drop the least recently used key."""
+    cache = TTLCache(ttl=60.0, max_entries=2)
+    calls: list[str] = []
+
+    def factory_for(key: str):
+        async def factory() -> str:
+            calls.append(key)
+            return key
+        return factory
+
+    await cache.get_or_set("a", factory_for("a"))
+    await cache.get_or_set("b", factory_for("b"))
+    await cache.get_or_set("a", factory_for("a"))  # hit: "b" is now oldest
+    await cache.get_or_set("c", factory_for("c"))  # evicts "b"
+    await cache.get_or_set("a", factory_for("a"))
+    await cache.get_or_set("b", factory_for("b"))
+
+    assert calls == ["a", "b", "c", "b"]
+    assert len(cache._entries) == 2
+    assert cache._locks == {}
@@ -11,7 +11,9 @@ from app.mappers.focus_mapper import FocusMapper
 from app.schemas import HCSMetricRecord
 
 
-@pytest.fixture
+# Neither fixture is mutated by the tests (they model_copy instead), so
+# both are built once per module.
+@pytest.fixture(scope="module")
 def mapper() -> FocusMapper:
     return FocusMapper(
         billing_currency="NGN",
@@ -22,7 +24,7 @@ def mapper() -> FocusMapper:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_hcs_record() -> HCSMetricRecord:
     return HCSMetricRecord(
         id="c9e7dd89-70b1-46a0-8851-f519c07610c4",
@@ -85,6 +87,26 @@ def test_map_many(
     assert len(results) == 2
 
 
+def test_map_many_matches_map_record(
+    mapper: FocusMapper, sample_hcs_record: HCSMetricRecord
+) -> None:
+    """The batch path should produce exactly what map_record produces."""
+    other = sample_hcs_record.model_copy(
+        update={"start_time": "2025-04-02 00:00:00", "tag": "owner"}
+    )
+    results = mapper.map_many([sample_hcs_record, other])
+    assert results == [mapper.map_record(sample_hcs_record), mapper.map_record(other)]
+
+
+def test_map_many_bad_record_raises(
+    mapper: FocusMapper, sample_hcs_record: HCSMetricRecord
+) -> None:
+    """A bad record in a batch should surface the per-record error."""
+    bad = sample_hcs_record.model_copy(update={"end_time": ""})
+    with pytest.raises(MappingFieldException):
+        mapper.map_many([sample_hcs_record, bad])
+
+
 def test_parse_tags(mapper: FocusMapper) -> None:
     """Verify tag parsing logic."""
     assert mapper._parse_tags("") == {}
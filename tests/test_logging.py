@@ -0,0 +1,33 @@
+"""
+Tests for request_id propagation into log records.
+"""
+
+import logging
+
+import httpx
+import pytest
+
+from app.core.logging import _RequestIdFilter
+from app.main import create_app
+
+
+@pytest.mark.asyncio
+async def test_unhandled_exception_log_carries_request_id(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """The 500 log is emitted outside the request context but keeps its request_id."""
+    application = create_app()
+
+    @application.get("/boom")
+    async def boom() -> None:
+        raise RuntimeError("boom")
+
+    caplog.handler.addFilter(_RequestIdFilter())
+    transport = httpx.ASGITransport(app=application, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as ac:
+        with caplog.at_level(logging.CRITICAL, logger="app.core.error_handlers"):
+            response = await ac.get("/boom", headers={"X-Request-ID": "req-500"})
+
+    assert response.status_code == 500
+    (record,) = [r for r in caplog.records if r.getMessage() == "Unhandled exception"]
+    assert record.request_id == "req-500"
@@ -0,0 +1,103 @@
+"""
+Tests for the /api/v1/metrics endpoint.
+"""
+
+from collections.abc import AsyncGenerator
+
+import httpx
+import orjson
+import pytest
+from fastapi import FastAPI
+
+from app.api.routes.metrics import _ndjson_lines
+from app.schemas import HCSMetricRecord
+from tests.conftest import iam_ok
+
+
+def _metric(record_id: str) -> dict:
+    return {
+        "id": record_id,
+        "region_code": "whdevp-env-5",
+        "resource_type_code": "hws.resource.type.volume",
+        "start_time": "2025-04-01 00:00:00",
+        "end_time": "2025-04-02 00:00:00",
+        "price": "4",
+        "usage_value": 8,
+    }
+
+
+def _paged_handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path.endswith("/v3/auth/tokens"):
+        return iam_ok()
+    start = orjson.loads(request.content)["start"]
+    return httpx.Response(
+        200,
+        json={"metrics": [_metric(f"rec-{start}"), _metric(f"rec-{start + 1}")], "total": 4},
+    )
+
+
+@pytest.mark.asyncio
+async def test_query_metrics_streams_ndjson(
+    app: FastAPI, client: httpx.AsyncClient
+) -> None:
+    """Metrics should stream one JSON record per line across all SC pages."""
+    async with httpx.AsyncClient(transport=httpx.MockTransport(_paged_handler)) as hc:
+        app.state.http_client = hc
+        response = await client.post(
+            "/api/v1/metrics/",
+            json={
+                "region_code": "whdevp-env-5",
+                "domain_id": "test-domain",
+                "start_time": "2025-04-01 00:00:00",
+                "end_time": "2025-04-02 00:00:00",
+                "limit": 2,
+            },
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [orjson.loads(line) for line in response.content.splitlines()]
+    assert [r["id"] for r in rows] == ["rec-0", "rec-1", "rec-2", "rec-3"]
+
+
+@pytest.mark.asyncio
+async def test_query_metrics_auth_failure_is_json_error(
+    app: FastAPI, client: httpx.AsyncClient
+) -> None:
+    """Errors on the first page should still produce the standard error body."""
+    transport = httpx.MockTransport(lambda req: httpx.Response(401, text="Unauthorized"))
+    async with httpx.AsyncClient(transport=transport) as hc:
+        app.state.http_client = hc
+        response = await client.post(
+            "/api/v1/metrics/",
+            json={
+                "region_code": "whdevp-env-5",
+                "domain_id": "test-domain",
+                "start_time": "2025-04-01 00:00:00",
+                "end_time": "2025-04-02 00:00:00",
+            },
+        )
+
+    assert response.status_code == 401
+    assert orjson.loads(response.content)["error_code"] == "AUTH_ERROR"
+
+
+@pytest.mark.asyncio
+async def test_ndjson_body_closes_pages_when_client_disconnects() -> None:
+    """Closing the response body mid-stream should close the upstream pages."""
+    closed = False
+
+    async def pages() -> AsyncGenerator[list[HCSMetricRecord], None]:
+        nonlocal closed
+        try:
+            while True:
+                yield [HCSMetricRecord.model_validate(_metric("rec"))]
+        finally:
+            closed = True
+
+    body = _ndjson_lines([], pages())
+    await anext(body)
+    await anext(body)
+    await body.aclose()
+
+    assert closed
@@ -2,139 +2,494 @@
 Tests for HCSClient.
 """
 
-import pytest
+import asyncio
+import json
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+
 import httpx
+import orjson
+import pytest
 
 from app.core.exceptions import (
     AuthenticationException,
-    SourceAPITimeoutException,
     SourceAPIException,
+    SourceAPITimeoutException,
 )
-from app.services.source_client import HCSClient
-
-
-@pytest.mark.asyncio
-async def test_fetch_metrics_timeout() -> None:
-    """Should raise SourceAPITimeoutException on timeout."""
-
-    async def _timeout_handler(request: httpx.Request) -> httpx.Response:
-        # IAM auth succeeds, metrics times out
-        if "/v3/auth/tokens" in str(request.url):
-            return httpx.Response(
-                201,
-                json={},
-                headers={"X-Subject-Token": "test-token"},
-            )
-        raise httpx.ReadTimeout("timed out")
-
-    transport = httpx.MockTransport(_timeout_handler)
-    async with httpx.AsyncClient(transport=transport) as hc:
-        client = HCSClient(http_client=hc)
-        with pytest.raises(SourceAPITimeoutException):
-            await client.fetch_metrics(
-                region_code="test-region",
-                domain_id="test-domain",
-                start_time="2025-04-01 00:00:00",
-                end_time="2025-04-02 00:00:00",
-                resource_type_code="hws.resource.type.volume",
-            )
-
-
-@pytest.mark.asyncio
-async def test_fetch_metrics_http_error() -> None:
-    """Should raise SourceAPIException on 500 from SC API."""
+from app.services.source_client import HCSClient, TokenCache
+from tests.conftest import iam_ok
+
+# One event loop for the whole file, shared with the session mock upstream
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+# Fixture from conftest: make_client(handler, **kwargs) -> HCSClient
+MakeClient = Callable[..., HCSClient]
+
+
+_METRICS_QUERY = {
+    "region_code": "test-region",
+    "domain_id": "test-domain",
+    "start_time": "2025-04-01 00:00:00",
+    "end_time": "2025-04-02 00:00:00",
+    "resource_type_code": "hws.resource.type.volume",
+}
+
+
+def _with_iam(
+    sc_handler: Callable[[httpx.Request], httpx.Response],
+) -> Callable[[httpx.Request], httpx.Response]:
+    """Wrap an SC handler so IAM token requests succeed."""
 
     def _handler(request: httpx.Request) -> httpx.Response:
-        if "/v3/auth/tokens" in str(request.url):
-            return httpx.Response(
-                201,
-                json={},
-                headers={"X-Subject-Token": "test-token"},
-            )
-        return httpx.Response(500, text="Internal Server Error")
-
-    transport = httpx.MockTransport(_handler)
-    async with httpx.AsyncClient(transport=transport) as hc:
-        client = HCSClient(http_client=hc)
-        with pytest.raises(SourceAPIException):
-            await client.fetch_metrics(
-                region_code="test-region",
-                domain_id="test-domain",
-                start_time="2025-04-01 00:00:00",
-                end_time="2025-04-02 00:00:00",
-                resource_type_code="hws.resource.type.volume",
-            )
-
-
-@pytest.mark.asyncio
-async def test_fetch_metrics_success() -> None:
+        if request.url.path.endswith("/v3/auth/tokens"):
+            return iam_ok()
+        return sc_handler(request)
+
+    return _handler
+
+
+def _read_timeout(request: httpx.Request) -> httpx.Response:
+    raise httpx.ReadTimeout("timed out")
+
+
+@pytest.mark.parametrize(
+    ("sc_handler", "expected"),
+    [
+        pytest.param(_read_timeout, SourceAPITimeoutException, id="timeout"),
+        pytest.param(
+            lambda request: httpx.Response(500, text="Internal Server Error"),
+            SourceAPIException,
+            id="http-500",
+        ),
+    ],
+)
+async def test_fetch_metrics_errors(
+    make_client: MakeClient,
+    sc_handler: Callable[[httpx.Request], httpx.Response],
+    expected: type[Exception],
+) -> None:
+    """SC timeouts and error statuses should raise the matching exception."""
+    client = make_client(_with_iam(sc_handler))
+    with pytest.raises(expected):
+        await client.fetch_metrics(**_METRICS_QUERY)
+
+
+async def test_fetch_vdcs_gateway_timeout_status(make_client: MakeClient) -> None:
+    """A 504 from SC should surface as SourceAPITimeoutException."""
+
+    client = make_client(
+        _with_iam(lambda request: httpx.Response(504, json={"error": "gateway timeout"}))
+    )
+    with pytest.raises(SourceAPITimeoutException) as exc_info:
+        await client.fetch_vdcs()
+
+    assert exc_info.value.details["status_code"] == 504
+
+
+_METRICS_BODY = orjson.dumps({
+    "metrics": [
+        {
+            "id": "c9e7dd89-70b1-46a0-8851-f519c07610c4",
+            "record_type": "20",
+            "user_id": "user-1",
+            "region_code": "whdevp-env-5",
+            "az_code": "az5.dc5",
+            "cloud_service_type_code": "hws.service.type.evs",
+            "resource_type_code": "hws.resource.type.volume",
+            "resource_spec_code": "IPSAN",
+            "resource_id": "4dcfaecc-ec31-424f-9811-32f33c811ce1",
+            "resource_display_name": "xp02-volume-0000",
+            "start_time": "2025-04-01 00:00:00",
+            "end_time": "2025-04-02 00:00:00",
+            "tag": "",
+            "upper_vdc_id": "eba900c3",
+            "vdc_id": "eba900c3",
+            "enterprise_project_id": "0",
+            "price": "4",
+            "usage_duration": 86400,
+            "accumulate_mode": "DURATION",
+            "price_unit": "GB",
+            "usage_value": 8,
+        }
+    ],
+    "time_zone": "Africa/Lagos",
+    "start_time": "2025-04-01 00:00:00",
+    "end_time": "2025-04-02 00:00:00",
+    "total": 1,
+    "marker": "",
+})
+
+
+async def test_fetch_metrics_success(make_client: MakeClient) -> None:
     """Should parse valid HCS metrics response."""
+    json_headers = {"Content-Type": "application/json"}
+    client = make_client(
+        _with_iam(
+            lambda request: httpx.Response(200, content=_METRICS_BODY, headers=json_headers)
+        )
+    )
+    records = await client.fetch_metrics(**_METRICS_QUERY)
+    assert len(records) == 1
+    assert records[0].id == "c9e7dd89-70b1-46a0-8851-f519c07610c4"
+    assert records[0].resource_display_name == "xp02-volume-0000"
+
+
+async def test_fetch_metrics_blank_body_is_empty(make_client: MakeClient) -> None:
+    """A 200 whose body is only whitespace should mean zero records."""
+    client = make_client(_with_iam(lambda request: httpx.Response(200, content=b" \r\n")))
+    assert await client.fetch_metrics(**_METRICS_QUERY) == []
+
+
+async def test_authenticate_failure(make_client: MakeClient) -> None:
+    """Should raise AuthenticationException on IAM 401."""
+    client = make_client(lambda req: httpx.Response(401, text="Unauthorized"))
+    with pytest.raises(AuthenticationException):
+        await client.authenticate()
+
+
+async def test_authenticate_sends_json_password_request(make_client: MakeClient) -> None:
+    """The IAM request body should be JSON with a matching Content-Type."""
+    seen: list[httpx.Request] = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return iam_ok()
+
+    assert await make_client(_handler).authenticate() == "test-token"
+
+    (request,) = seen
+    assert request.headers["content-type"] == "application/json"
+    assert json.loads(request.content)["auth"]["identity"]["methods"] == ["password"]
+
+
+async def test_token_cache_shared_across_clients(make_client: MakeClient) -> None:
+    """A shared TokenCache should let a second client skip IAM entirely."""
+    iam_calls = 0
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        nonlocal iam_calls
+        iam_calls += 1
+        return iam_ok(expires_at="2099-01-01T00:00:00.000000Z")
+
+    cache = TokenCache()
+    first = make_client(_handler, token_cache=cache)
+    second = make_client(_handler, token_cache=cache)
+    assert await first.authenticate() == "test-token"
+    assert await second.authenticate() == "test-token"
+    assert iam_calls == 1
+
+
+async def test_cached_token_served_without_lock(make_client: MakeClient) -> None:
+    """A valid shared token should be returned even while the lock is held."""
+    cache = TokenCache()
+    client = make_client(lambda request: iam_ok(), token_cache=cache)
+    cache.set(client._token_cache_key, "cached-token", time.time() + 3600)
+
+    async with cache.lock:
+        token = await asyncio.wait_for(client.authenticate(), timeout=1)
+
+    assert token == "cached-token"
+
+
+async def test_token_refreshed_in_background_before_expiry(make_client: MakeClient) -> None:
+    """A token close to expiry should be used while a new one is fetched."""
+    expiry = datetime.now(tz=timezone.utc) + timedelta(minutes=3)
+    iam_tokens = iter([("old-token", expiry.isoformat()),
+                       ("new-token", "2099-01-01T00:00:00.000000Z")])
+    sc_tokens: list[str] = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/v3/auth/tokens"):
+            token, expires_at = next(iam_tokens)
+            return iam_ok(token, expires_at)
+        sc_tokens.append(request.headers["X-Auth-Token"])
+        return httpx.Response(200, json={"regions": []})
+
+    cache = TokenCache()
+    client = make_client(_handler, token_cache=cache)
+    await client.authenticate()
+    await client.fetch_regions()
+    await asyncio.gather(*cache.refresh_tasks.values())
+
+    assert sc_tokens == ["old-token"]
+    assert cache.get(client._token_cache_key)[0] == "new-token"
 
-    metrics_payload = {
-        "metrics": [
-            {
-                "id": "c9e7dd89-70b1-46a0-8851-f519c07610c4",
-                "record_type": "20",
-                "user_id": "user-1",
-                "region_code": "whdevp-env-5",
-                "az_code": "az5.dc5",
-                "cloud_service_type_code": "hws.service.type.evs",
-                "resource_type_code": "hws.resource.type.volume",
-                "resource_spec_code": "IPSAN",
-                "resource_id": "4dcfaecc-ec31-424f-9811-32f33c811ce1",
-                "resource_display_name": "xp02-volume-0000",
-                "start_time": "2025-04-01 00:00:00",
-                "end_time": "2025-04-02 00:00:00",
-                "tag": "",
-                "upper_vdc_id": "eba900c3",
-                "vdc_id": "eba900c3",
-                "enterprise_project_id": "0",
-                "price": "4",
-                "usage_duration": 86400,
-                "accumulate_mode": "DURATION",
-                "price_unit": "GB",
-                "usage_value": 8,
-            }
-        ],
+
+async def test_background_refresh_does_not_block_other_clients(
+    make_client: MakeClient,
+) -> None:
+    """While one client refreshes ahead of expiry, a fresh client keeps going."""
+    cache = TokenCache()
+    refresh_started = asyncio.Event()
+    sc_tokens: list[str] = []
+
+    async def _handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/v3/auth/tokens"):
+            refresh_started.set()
+            await asyncio.sleep(0.3)
+            return iam_ok("new-token", "2099-01-01T00:00:00.000000Z")
+        sc_tokens.append(request.headers["X-Auth-Token"])
+        return httpx.Response(200, json={"regions": []})
+
+    first = make_client(_handler, token_cache=cache)
+    # Inside the refresh-ahead window, still well before expiry
+    cache.set(first._token_cache_key, "old-token", time.time() + 180)
+    await first.fetch_regions()
+    await refresh_started.wait()
+
+    # A per-request client must not wait on the in-flight IAM call
+    second = make_client(_handler, token_cache=cache)
+    await asyncio.wait_for(second.fetch_regions(), timeout=0.2)
+    assert sc_tokens == ["old-token", "old-token"]
+
+    await asyncio.gather(*cache.refresh_tasks.values())
+    assert cache.get(first._token_cache_key)[0] == "new-token"
+
+
+async def test_failed_background_refresh_backs_off(make_client: MakeClient) -> None:
+    """After a failed ahead-of-expiry refresh, later requests don't retry IAM at once."""
+    cache = TokenCache()
+    iam_calls = 0
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        nonlocal iam_calls
+        if request.url.path.endswith("/v3/auth/tokens"):
+            iam_calls += 1
+            return httpx.Response(500, text="IAM unavailable")
+        return httpx.Response(200, json={"regions": []})
+
+    for _ in range(3):
+        client = make_client(_handler, token_cache=cache)
+        cache.set(client._token_cache_key, "old-token", time.time() + 180)
+        await client.fetch_regions()
+        await asyncio.gather(*cache.refresh_tasks.values())
+
+    assert iam_calls == 1
+
+
+async def test_fetch_regions_served_from_lookup_cache(make_client: MakeClient) -> None:
+    """A second fetch_regions within the TTL should not hit the SC API."""
+    sc_calls = 0
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        nonlocal sc_calls
+        if request.url.path.endswith("/v3/auth/tokens"):
+            return iam_ok()
+        sc_calls += 1
+        return httpx.Response(
+            200, json={"regions": [{"id": "whdevp-env-5"}], "total": 1}
+        )
+
+    client = make_client(_handler)
+    first = await client.fetch_regions()
+    second = await client.fetch_regions()
+    assert [r.id for r in first] == [r.id for r in second] == ["whdevp-env-5"]
+    assert sc_calls == 1
+
+
+async def test_iter_metrics_prefetches_next_page(make_client: MakeClient) -> None:
+    """The next page should be requested while the caller holds the current one."""
+    starts: list[int] = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/v3/auth/tokens"):
+            return iam_ok()
+        start = json.loads(request.content)["start"]
+        starts.append(start)
+        record = {
+            "id": f"rec-{start}",
+            "start_time": "2025-04-01 00:00:00",
+            "end_time": "2025-04-02 00:00:00",
+        }
+        return httpx.Response(200, json={"metrics": [record], "total": 2})
+
+    client = make_client(_handler)
+    pages = client.iter_metrics(
+        region_code="whdevp-env-5",
+        domain_id="test-domain",
+        start_time="2025-04-01 00:00:00",
+        end_time="2025-04-02 00:00:00",
+        limit=1,
+    )
+    first = await anext(pages)
+    await asyncio.sleep(0.01)
+    assert starts == [0, 1]
+    second = await anext(pages)
+    assert [r.id for r in first + second] == ["rec-0", "rec-1"]
+    assert await anext(pages, None) is None
+
+
+async def test_iter_metrics_page_bodies(make_client: MakeClient) -> None:
+    """Each page body should carry the full query plus its own start offset."""
+    bodies: list[dict] = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/v3/auth/tokens"):
+            return iam_ok()
+        bodies.append(json.loads(request.content))
+        record = {
+            "id": "rec",
+            "start_time": "2025-04-01 00:00:00",
+            "end_time": "2025-04-02 00:00:00",
+        }
+        return httpx.Response(200, json={"metrics": [record], "total": 3})
+
+    client = make_client(_handler)
+    await client.fetch_metrics(
+        region_code="whdevp-env-5",
+        domain_id="test-domain",
+        start_time="2025-04-01 00:00:00",
+        end_time="2025-04-02 00:00:00",
+        resource_type_code="hws.resource.type.volume",
+        limit=1,
+    )
+
+    query = {
+        "region_code": "whdevp-env-5",
+        "start_time": "2025-04-01 00:00:00",
+        "end_time": "2025-04-02 00:00:00",
         "time_zone": "Africa/Lagos",
+        "period": "daily",
+        "locale": "en_US",
+        "domain_id": "test-domain",
+        "resource_type_code": "hws.resource.type.volume",
+        "limit": 1,
+    }
+    assert sorted(bodies, key=lambda b: b["start"]) == [
+        {**query, "start": start} for start in (0, 1, 2)
+    ]
+
+
+async def test_identical_concurrent_metrics_queries_share_requests(make_client: MakeClient) -> None:
+    """Two identical in-flight queries should cost one SC call per page."""
+    sc_calls = 0
+
+    async def _handler(request: httpx.Request) -> httpx.Response:
+        nonlocal sc_calls
+        if request.url.path.endswith("/v3/auth/tokens"):
+            return iam_ok()
+        sc_calls += 1
+        await asyncio.sleep(0.01)
+        start = json.loads(request.content)["start"]
+        record = {
+            "id": f"rec-{start}",
+            "start_time": "2025-04-01 00:00:00",
+            "end_time": "2025-04-02 00:00:00",
+        }
+        return httpx.Response(200, json={"metrics": [record], "total": 2})
+
+    query = {
+        "region_code": "whdevp-env-5",
+        "domain_id": "test-domain",
         "start_time": "2025-04-01 00:00:00",
         "end_time": "2025-04-02 00:00:00",
-        "total": 1,
-        "marker": "",
+        "limit": 1,
     }
+    client = make_client(_handler)
+    await client.authenticate()
+    first, second = await asyncio.gather(
+        client.fetch_metrics(**query), client.fetch_metrics(**query),
+    )
+
+    assert [r.id for r in first] == [r.id for r in second] == ["rec-0", "rec-1"]
+    assert sc_calls == 2
+
+
+async def test_fetch_metrics_concurrent(make_client: MakeClient) -> None:
+    """Parallel distinct queries on a cold client should all succeed, sharing one token."""
+    iam_calls = 0
+    sc_domains: list[str] = []
+
+    async def _handler(request: httpx.Request) -> httpx.Response:
+        nonlocal iam_calls
+        if request.url.path.endswith("/v3/auth/tokens"):
+            iam_calls += 1
+            return iam_ok()
+        domain_id = json.loads(request.content)["domain_id"]
+        sc_domains.append(domain_id)
+        await asyncio.sleep(0.01)
+        record = {
+            "id": domain_id,
+            "start_time": "2025-04-01 00:00:00",
+            "end_time": "2025-04-02 00:00:00",
+        }
+        return httpx.Response(200, json={"metrics": [record], "total": 1})
+
+    client = make_client(_handler)
+    domains = [f"domain-{i}" for i in range(8)]
+    async with asyncio.TaskGroup() as tg:
+        tasks = [
+            tg.create_task(client.fetch_metrics(**{**_METRICS_QUERY, "domain_id": d}))
+            for d in domains
+        ]
+
+    assert [[r.id for r in t.result()] for t in tasks] == [[d] for d in domains]
+    assert sorted(sc_domains) == domains
+    assert iam_calls == 1
+
+
+async def test_fetch_vdcs_pages_concurrently_in_order(make_client: MakeClient) -> None:
+    """Remaining VDC pages should be requested together and returned in order."""
+    in_flight = 0
+    peak = 0
+
+    async def _handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        if request.url.path.endswith("/v3/auth/tokens"):
+            return iam_ok()
+        start = int(request.url.params["start"])
+        in_flight += 1
+        peak = max(peak, in_flight)
+        # Later pages answer first, so ordering can't come from arrival time
+        await asyncio.sleep(0.01 * (4 - start))
+        in_flight -= 1
+        return httpx.Response(
+            200,
+            json={"vdcs": [{"id": f"vdc-{start}"}], "total": 4},
+        )
+
+    client = make_client(_handler)
+    vdcs = await client.fetch_vdcs(limit=1)
+    assert [v.id for v in vdcs] == ["vdc-0", "vdc-1", "vdc-2", "vdc-3"]
+    assert peak == 3
+
+
+async def test_rejected_token_reauthenticates_once(make_client: MakeClient) -> None:
+    """A 401 from SC should refresh the token and retry the call once."""
+    iam_calls = 0
+    seen_tokens: list[str] = []
 
     def _handler(request: httpx.Request) -> httpx.Response:
-        if "/v3/auth/tokens" in str(request.url):
-            return httpx.Response(
-                201,
-                json={},
-                headers={"X-Subject-Token": "test-token"},
-            )
-        return httpx.Response(200, json=metrics_payload)
-
-    transport = httpx.MockTransport(_handler)
-    async with httpx.AsyncClient(transport=transport) as hc:
-        client = HCSClient(http_client=hc)
-        records = await client.fetch_metrics(
-            region_code="whdevp-env-5",
-            domain_id="test-domain",
-            start_time="2025-04-01 00:00:00",
-            end_time="2025-04-02 00:00:00",
-            resource_type_code="hws.resource.type.volume",
+        nonlocal iam_calls
+        if request.url.path.endswith("/v3/auth/tokens"):
+            iam_calls += 1
+            return iam_ok(f"token-{iam_calls}")
+        seen_tokens.append(request.headers["X-Auth-Token"])
+        if request.headers["X-Auth-Token"] == "token-1":
+            return httpx.Response(401, text="Unauthorized")
+        return httpx.Response(
+            200, json={"regions": [{"id": "whdevp-env-5"}], "total": 1}
         )
-        assert len(records) == 1
-        assert records[0].id == "c9e7dd89-70b1-46a0-8851-f519c07610c4"
-        assert records[0].resource_display_name == "xp02-volume-0000"
 
+    client = make_client(_handler)
+    regions = await client.fetch_regions()
+    assert [r.id for r in regions] == ["whdevp-env-5"]
+    assert seen_tokens == ["token-1", "token-2"]
+    assert iam_calls == 2
 
-@pytest.mark.asyncio
-async def test_authenticate_failure() -> None:
-    """Should raise AuthenticationException on IAM 401."""
 
-    transport = httpx.MockTransport(
-        lambda req: httpx.Response(401, text="Unauthorized")
-    )
-    async with httpx.AsyncClient(transport=transport) as hc:
-        client = HCSClient(http_client=hc)
-        with pytest.raises(AuthenticationException):
-            await client.authenticate()
+@pytest.mark.parametrize(
+    ("content", "expected"),
+    [
+        pytest.param(b"  <html><body>Sign in</body></html>", True, id="html"),
+        pytest.param(b"redirect: /authui/login?service=sc", True, id="text-marker"),
+        pytest.param(b'{"metrics": [], "total": 0}', False, id="json"),
+        pytest.param(b'\n{"tag": "see /authui/login"}', False, id="json-with-marker"),
+        pytest.param(b"", False, id="empty"),
+    ],
+)
+async def test_is_login_redirect(content: bytes, expected: bool) -> None:
+    """HTML and marker-bearing text bodies are redirects; JSON bodies never are."""
+    response = httpx.Response(200, content=content)
+    assert HCSClient._is_login_redirect(response) is expected
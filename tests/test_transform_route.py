@@ -2,8 +2,16 @@
 Tests for the /api/v1/transform endpoint.
 """
 
-import pytest
 import httpx
+import orjson
+import pytest
+from fastapi import FastAPI
+
+from app.schemas.focus_schema import FocusResponse
+from tests.conftest import iam_ok
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+_EMPTY_BODY = b"{}"
 
 
 @pytest.mark.asyncio
@@ -11,35 +19,124 @@ async def test_health_check(client: httpx.AsyncClient) -> None:
     """Health endpoint should return 200 with app info."""
     response = await client.get("/health")
     assert response.status_code == 200
-    data = response.json()
+    data = orjson.loads(response.content)
     assert data["status"] == "healthy"
     assert "version" in data
 
 
 @pytest.mark.asyncio
-async def test_transform_missing_required_fields(client: httpx.AsyncClient) -> None:
-    """Transform should return 422 when required fields are missing."""
-    response = await client.post("/api/v1/transform/", json={})
+@pytest.mark.parametrize(
+    "body",
+    [
+        pytest.param(_EMPTY_BODY, id="missing-required-fields"),
+        pytest.param(
+            orjson.dumps({
+                "region_code": "test",
+                "domain_id": "test",
+                "start_time": "2025-04-01 00:00:00",
+                "end_time": "2025-04-02 00:00:00",
+                "resource_type_code": "hws.resource.type.volume",
+                "limit": 0,
+            }),
+            id="limit-below-1",
+        ),
+    ],
+)
+async def test_transform_validation(client: httpx.AsyncClient, body: bytes) -> None:
+    """Transform should return a 422 validation error for bad request bodies."""
+    response = await client.post(
+        "/api/v1/transform/", content=body, headers=_JSON_HEADERS
+    )
     assert response.status_code == 422
-    data = response.json()
+    data = orjson.loads(response.content)
     assert data["error"] is True
     assert data["error_code"] == "VALIDATION_ERROR"
 
 
 @pytest.mark.asyncio
-async def test_transform_invalid_limit(client: httpx.AsyncClient) -> None:
-    """Transform should return 422 for limit < 1."""
+async def test_request_id_echoed_and_used_in_errors(client: httpx.AsyncClient) -> None:
+    """The incoming X-Request-ID should be echoed and appear in error bodies."""
     response = await client.post(
         "/api/v1/transform/",
-        json={
-            "region_code": "test",
-            "domain_id": "test",
+        content=_EMPTY_BODY,
+        headers={**_JSON_HEADERS, "X-Request-ID": "req-123"},
+    )
+    assert response.headers["X-Request-ID"] == "req-123"
+    assert orjson.loads(response.content)["request_id"] == "req-123"
+
+
+@pytest.mark.asyncio
+async def test_transform_returns_focus_records(
+    app: FastAPI, client: httpx.AsyncClient
+) -> None:
+    """A successful transform should return FOCUS records with UTC timestamps."""
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/v3/auth/tokens"):
+            return iam_ok()
+        record = {
+            "id": "rec-0",
+            "resource_id": "vol-1",
             "start_time": "2025-04-01 00:00:00",
             "end_time": "2025-04-02 00:00:00",
-            "resource_type_code": "hws.resource.type.volume",
-            "limit": 0,
-        },
-    )
-    assert response.status_code == 422
-    data = response.json()
-    assert data["error"] is True
+            "price": "4",
+            "usage_value": 8,
+        }
+        return httpx.Response(200, json={"metrics": [record], "total": 1})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(_handler)) as hc:
+        app.state.http_client = hc
+        response = await client.post(
+            "/api/v1/transform/",
+            json={
+                "region_code": "whdevp-env-5",
+                "domain_id": "test-domain",
+                "start_time": "2025-04-01 00:00:00",
+                "end_time": "2025-04-02 00:00:00",
+            },
+        )
+
+    assert response.status_code == 200
+    data = orjson.loads(response.content)
+    assert data["total_count"] == 1
+    assert data["metadata"]["resource_type_code"] == "all"
+    record = data["records"][0]
+    assert record["billed_cost"] == 32.0
+    assert record["charge_period_start"] == "2025-04-01T00:00:00Z"
+
+
+@pytest.mark.asyncio
+async def test_transform_streams_all_pages(
+    app: FastAPI, client: httpx.AsyncClient
+) -> None:
+    """Records from every SC page should land in one valid FocusResponse body."""
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/v3/auth/tokens"):
+            return iam_ok()
+        start = orjson.loads(request.content)["start"]
+        record = {
+            "id": f"rec-{start}",
+            "resource_id": f"vol-{start}",
+            "start_time": "2025-04-01 00:00:00",
+            "end_time": "2025-04-02 00:00:00",
+        }
+        return httpx.Response(200, json={"metrics": [record], "total": 3})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(_handler)) as hc:
+        app.state.http_client = hc
+        response = await client.post(
+            "/api/v1/transform/",
+            json={
+                "region_code": "whdevp-env-5",
+                "domain_id": "test-domain",
+                "start_time": "2025-04-01 00:00:00",
+                "end_time": "2025-04-02 00:00:00",
+                "limit": 1,
+            },
+        )
+
+    assert response.status_code == 200
+    body = FocusResponse.model_validate_json(response.content)
+    assert body.total_count == 3
+    assert [r.resource_id for r in body.records] == ["vol-0", "vol-1", "vol-2"]
@@ -0,0 +1,89 @@
+"""
+Tests for TransformService.
+"""
+
+import asyncio
+import json
+from collections.abc import Callable
+
+import httpx
+import pytest
+
+from app.core.exceptions import SourceAPIException
+from app.services.source_client import HCSClient
+from app.services.transform_service import TransformService
+from tests.conftest import iam_ok
+
+# Fixture from conftest: make_client(handler, **kwargs) -> HCSClient
+MakeClient = Callable[..., HCSClient]
+
+
+@pytest.mark.asyncio
+async def test_transform_many_runs_combinations_concurrently(make_client: MakeClient) -> None:
+    """Every region x resource type should be queried, overlapping, in order."""
+    in_flight = 0
+    peak = 0
+
+    async def _handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        if request.url.path.endswith("/v3/auth/tokens"):
+            return iam_ok()
+        body = json.loads(request.content)
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        record = {
+            "id": "rec",
+            "region_code": body["region_code"],
+            "resource_type_code": body["resource_type_code"],
+            "resource_id": "res-1",
+            "start_time": "2025-04-01 00:00:00",
+            "end_time": "2025-04-02 00:00:00",
+        }
+        return httpx.Response(200, json={"metrics": [record], "total": 1})
+
+    service = TransformService(hcs_client=make_client(_handler))
+    results = await service.transform_many(
+        region_codes=["r1", "r2"],
+        domain_ids=["d1"],
+        start_time="2025-04-01 00:00:00",
+        end_time="2025-04-02 00:00:00",
+        resource_type_codes=["vm", "volume"],
+    )
+
+    assert [r.metadata["region_code"] for r in results] == ["r1", "r1", "r2", "r2"]
+    assert [r.records[0].resource_type for r in results] == ["vm", "volume"] * 2
+    assert peak == 4
+
+
+@pytest.mark.asyncio
+async def test_transform_many_failure_cancels_other_combinations(
+    make_client: MakeClient,
+) -> None:
+    """One failing combination should raise its error and cancel the rest."""
+    cancelled: list[str] = []
+
+    async def _handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/v3/auth/tokens"):
+            return iam_ok()
+        region_code = json.loads(request.content)["region_code"]
+        if region_code == "bad":
+            return httpx.Response(400, text="Bad Request")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(region_code)
+            raise
+        return httpx.Response(200, json={"metrics": [], "total": 0})
+
+    service = TransformService(hcs_client=make_client(_handler))
+    with pytest.raises(SourceAPIException):
+        await service.transform_many(
+            region_codes=["r1", "bad", "r2"],
+            domain_ids=["d1"],
+            start_time="2025-04-01 00:00:00",
+            end_time="2025-04-02 00:00:00",
+        )
+
+    assert sorted(cancelled) == ["r1", "r2"]